@@ -0,0 +1,9 @@
+"""Benchmarks do Portal Corpore.
+
+Uso (a partir da raiz do repositório):
+
+    python -m benchmarks --sizes 1000 10000 100000 --out resultados.json
+
+Cada tamanho roda num diretório temporário próprio, com base e pastas de
+documentos sintéticas (ver `benchmarks.synthetic`).
+"""
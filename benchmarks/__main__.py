@@ -0,0 +1,172 @@
+"""Executa os benchmarks e grava os resultados em JSON.
+
+Cada tamanho roda num subprocesso (caches de processo e medições "a frio"
+limpos) dentro de um diretório temporário descartado no final.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "corpore.py")
+
+def measure(fn, repeat=1, setup=None):
+    """Tempos (ms) de `repeat` chamadas de `fn(setup())`, sem contar o setup."""
+    samples = []
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        start = time.perf_counter()
+        fn(arg) if setup else fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "repeticoes": repeat,
+        "min_ms": round(min(samples), 3),
+        "mediana_ms": round(statistics.median(samples), 3),
+        "media_ms": round(statistics.fmean(samples), 3),
+        "max_ms": round(max(samples), 3),
+    }
+
+def run_size(n, docs_users):
+    """Mede as operações para `n` profissionais no diretório atual."""
+    import logging
+
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    import importlib
+
+    sys.path.insert(0, ROOT)
+    results = {}
+    # Início a frio: importação do pacote (feita uma vez por processo) e do
+    # painel da gestão, que só é importado quando um administrador entra.
+    results["importar_portal"] = measure(lambda: importlib.import_module("portal.app"))
+    results["importar_painel_gestao"] = measure(lambda: importlib.import_module("portal.ui.admin"))
+
+    from portal import auth, config, files, notifications, users
+    from streamlit.runtime.download_data_util import convert_data_to_bytes_and_infer_mime
+    from streamlit.testing.v1 import AppTest
+
+    from benchmarks import synthetic
+
+    rng = random.Random(1)
+    results["gerar_dados"] = measure(lambda: synthetic.populate(n, docs_users=docs_users))
+    repo = users.get_repository()
+
+    def cold(_):
+        users.load_db()
+
+    results["load_db_frio"] = measure(cold, 3, setup=lambda: setattr(repo, "raw", None))
+    results["load_db_quente"] = measure(users.load_db, 20)
+
+    phones = [synthetic.phone_for(rng.randrange(n)) for _ in range(200)]
+    results["login_busca"] = measure(lambda phone: users.get_user(phone), len(phones), setup=iter(phones).__next__)
+    stored = users.get_user(synthetic.ADMIN_PHONE)["Senha"]
+    results["login_verificar_senha"] = measure(lambda: auth.verify_pass(stored, synthetic.ADMIN_PASSWORD), 3)
+
+    def save(phone):
+        user = users.get_user(phone)
+        user["Disponibilidade"] = rng.choice(["Manhã", "Tarde", "Noite"])
+        users.save_user(user, old_phone_key=user["Telefone"])
+
+    phones = [synthetic.phone_for(rng.randrange(n)) for _ in range(50)]
+    results["save_user"] = measure(save, len(phones), setup=iter(phones).__next__)
+    results["send_notification_to_all"] = measure(lambda: notifications.send_notification_to_all("Aviso de benchmark", "bench"), 50)
+
+    folders = [
+        os.path.join(config.BASE_FILES_DIR, synthetic.phone_for(i), "recebidos_gestao")
+        for i in range(min(50, docs_users, n))
+    ]
+    if folders:
+        results["get_files_frio"] = measure(files.get_files, len(folders), setup=iter(folders).__next__)
+        results["get_files_quente"] = measure(lambda: files.get_files(folders[0]), 100)
+
+    if folders:
+        # Mesmo caminho do st.download_button com `data=` chamável: o tipo
+        # devolvido precisa ser aceito e o ZIP precisa abrir íntegro.
+        def download_zip():
+            data, _mime = convert_data_to_bytes_and_infer_mime(
+                files.user_archive(synthetic.phone_for(0)), TypeError("tipo não aceito pelo st.download_button")
+            )
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                if archive.testzip() is not None:
+                    raise ValueError("ZIP corrompido")
+
+        results["baixar_tudo_zip"] = measure(download_zip, 3)
+
+    start = min(100, n // 2)
+    victims = [synthetic.phone_for(i) for i in range(start, min(start + 20, n))]
+    if victims:
+        results["delete_user"] = measure(users.delete_user, len(victims), setup=iter(victims).__next__)
+
+    admin = users.get_user(synthetic.ADMIN_PHONE)
+    user = users.get_user(synthetic.phone_for(0))
+    for name, session_user in (("painel_admin", admin), ("painel_usuario", user)):
+        app = AppTest.from_file(APP, default_timeout=600)
+        app.session_state["user"] = session_user
+        results[f"{name}_primeiro"] = measure(app.run)
+        results[f"{name}_rerun"] = measure(app.run, 3)
+        if app.exception:
+            results[f"{name}_erros"] = [e.message for e in app.exception]
+    return results
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--docs-users", type=int, default=200, help="profissionais com documentos gerados")
+    parser.add_argument("--out", default="benchmark.json")
+    parser.add_argument("--single", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.single is not None:
+        json.dump(run_size(args.single, args.docs_users), sys.stdout)
+        return
+
+    report = {
+        "revisao": git_revision(),
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "armazenamento": os.environ.get("CORPORE_STORAGE", "sqlite"),
+        "resultados": {},
+    }
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])))
+    for n in args.sizes:
+        workdir = tempfile.mkdtemp(prefix=f"corpore-bench-{n}-")
+        try:
+            print(f"{n} profissionais...", file=sys.stderr)
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks", "--single", str(n), "--docs-users", str(args.docs_users)],
+                cwd=workdir, env=env, capture_output=True, text=True,
+            )
+            if out.returncode:
+                sys.stderr.write(out.stderr)
+                raise SystemExit(f"benchmark com {n} profissionais falhou")
+            report["resultados"][str(n)] = json.loads(out.stdout)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    for n, results in report["resultados"].items():
+        print(f"\n{n} profissionais", file=sys.stderr)
+        for name, stats in results.items():
+            if "mediana_ms" in stats:
+                print(f"  {name:32s} {stats['mediana_ms']:10.2f} ms (mediana de {stats['repeticoes']})", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
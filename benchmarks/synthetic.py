@@ -0,0 +1,78 @@
+"""Gerador de dados sintéticos: profissionais e árvores de documentos."""
+import os
+import random
+from datetime import date, timedelta
+
+import pandas as pd
+
+from portal import auth, config, files, storage, users
+
+ADMIN_PHONE = "11900000000"
+ADMIN_PASSWORD = "admin"
+USER_PASSWORD = "senha"
+
+FIRST_NAMES = ["Ana", "Bruno", "Carla", "Diego", "Elisa", "Felipe", "Gabriela", "Heitor", "Isabela", "João",
+               "Larissa", "Marcos", "Natália", "Otávio", "Paula", "Rafael", "Sofia", "Tiago", "Vanessa", "Yuri"]
+LAST_NAMES = ["Silva", "Souza", "Oliveira", "Santos", "Pereira", "Lima", "Carvalho", "Ferreira", "Almeida", "Costa"]
+SKILLS = ["pilates", "fisioterapia", "gestantes", "idosos", "RPG", "esportiva", "neurológica", "respiratória",
+          "ortopedia", "acupuntura", "drenagem", "pós-operatório", "liberação miofascial", "treino funcional"]
+BANKS = ["Banco do Brasil", "Caixa", "Itaú", "Bradesco", "Nubank", "Inter", "Sicoob"]
+
+def phone_for(i):
+    return f"279{i:08d}"
+
+def make_users(n, seed=0):
+    """DataFrame com `n` profissionais na forma legível (sem senhas)."""
+    rng = random.Random(seed)
+    today = date.today()
+    rows = []
+    for i in range(n):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        birth = date(1960, 1, 1) + timedelta(days=rng.randrange(365 * 45))
+        rows.append({
+            "Telefone": phone_for(i),
+            "Nome": f"{first} {last} {i}",
+            "Role": "user",
+            "Unidade": rng.choice(config.UNIDADES_OPCOES),
+            "Email": f"{first.lower()}.{i}@exemplo.com",
+            "Pix": f"{first.lower()}{i}@pix",
+            "Banco": rng.choice(BANKS),
+            "Disponibilidade": rng.choice(["Manhã", "Tarde", "Noite", "Integral"]),
+            "Data Cadastro": (today - timedelta(days=rng.randrange(730))).strftime("%Y-%m-%d"),
+            "Notificacao": "",
+            "Resumo": "Atendimento em " + ", ".join(rng.sample(SKILLS, 3)),
+            "Nascimento": birth.strftime("%d/%m/%Y"),
+        })
+    return pd.DataFrame(rows)
+
+def populate(n, docs_users=200, files_per_folder=5, file_size=4096, seed=0):
+    """Grava `n` profissionais + um admin no diretório atual e cria documentos.
+
+    Os registros vão direto para o backend já na forma gravada (como faria
+    uma importação); todos compartilham o mesmo hash de senha para não pagar
+    o KDF `n` vezes. Os primeiros `docs_users` recebem arquivos nas pastas.
+    """
+    rng = random.Random(seed)
+    frame = make_users(n, seed)
+    for col in config.SENSITIVE_COLUMNS:
+        if col in frame.columns:
+            frame[col] = users.encode_column(frame[col])
+    frame["Senha"] = auth.hash_pass(USER_PASSWORD)
+
+    admin = {col: "" for col in config.ALL_COLUMNS}
+    admin.update({"Telefone": ADMIN_PHONE, "Nome": "Admin Benchmark", "Role": "admin", "Unidade": "Matriz",
+                  "Senha": auth.hash_pass(ADMIN_PASSWORD), "Data Cadastro": date.today().strftime("%Y-%m-%d")})
+    frame = pd.concat([pd.DataFrame([admin]), frame], ignore_index=True)
+    storage.get_storage().import_frame(frame.reindex(columns=config.ALL_COLUMNS).fillna(""))
+
+    files.init_environment()
+    payload = os.urandom(file_size)
+    for i in range(min(docs_users, n)):
+        phone = phone_for(i)
+        files.ensure_user_dirs(phone)
+        root = os.path.join(config.BASE_FILES_DIR, phone)
+        for folder in os.listdir(root):
+            for j in range(rng.randint(1, files_per_folder)):
+                with open(os.path.join(root, folder, f"documento_{j}.pdf"), "wb") as f:
+                    f.write(payload)
+    return len(frame)
@@ -0,0 +1,43 @@
+"""Snapshots pela linha de comando (cron ou recuperação sem abrir o portal).
+
+    python corpore_backup.py criar
+    python corpore_backup.py listar
+    python corpore_backup.py restaurar 20250101-030000
+    python corpore_backup.py limpar
+
+Rode no mesmo diretório (e com as mesmas variáveis CORPORE_*) do portal.
+"""
+import argparse
+import logging
+import sys
+
+logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+from portal import config, files, snapshots  # noqa: E402
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Snapshots do Portal Corpore")
+    commands = parser.add_subparsers(dest="comando", required=True)
+    commands.add_parser("criar", help="tira um snapshot agora")
+    commands.add_parser("listar", help="lista os snapshots completos")
+    restore = commands.add_parser("restaurar", help="volta ao snapshot indicado")
+    restore.add_argument("nome")
+    prune = commands.add_parser("limpar", help="aplica a retenção")
+    prune.add_argument("--manter", type=int, default=config.SNAPSHOT_KEEP)
+    args = parser.parse_args(argv)
+
+    if args.comando == "criar":
+        meta = snapshots.create_snapshot("linha de comando")
+        print(f"{meta['nome']}: {meta.get('copiados', 0)} copiado(s), {meta.get('reaproveitados', 0)} reaproveitado(s)")
+    elif args.comando == "listar":
+        for meta in snapshots.list_snapshots():
+            print(f"{meta['nome']}  {meta['criado_em']}  {meta['motivo']}  {files.format_size(meta.get('bytes_copiados', 0))}")
+    elif args.comando == "restaurar":
+        snapshots.restore_snapshot(args.nome)
+        print(f"Restaurado: {args.nome}")
+    else:
+        for name in snapshots.prune_snapshots(args.manter):
+            print(f"Removido: {name}")
+
+if __name__ == "__main__":
+    sys.exit(main())
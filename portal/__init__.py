@@ -0,0 +1,18 @@
+"""Portal Corpore: código da aplicação Streamlit (o script de entrada é `corpore.py`).
+
+Módulos:
+    config         caminhos, limites e opções
+    util           normalização de telefones e textos
+    diagnostics    métricas e perfis de execução
+    auth           campos sensíveis, senhas e tentativas de login
+    storage        backends da tabela de usuários (CSV/SQLite)
+    users          repositório em memória e API de usuários
+    files          pastas, uploads, manifestos, blobs, prévias e ZIPs
+    notifications  avisos da gestão
+    events         calendário de eventos
+    transfer       importação/exportação de planilhas
+    indexes        indicadores, busca e aniversários
+    jobs           tarefas em segundo plano
+    snapshots      backups incrementais
+    ui             telas (login, painel do profissional, painel da gestão)
+"""
@@ -0,0 +1,70 @@
+"""Orquestração de cada execução do script: CSS, roteamento de telas e métricas.
+
+Os módulos do pacote são importados uma vez por processo; a cada clique o
+Streamlit reexecuta só o `corpore.py`, que chama `main()`. O painel do
+administrador (e o que só ele usa) é importado na primeira vez que é aberto.
+"""
+import time
+
+import streamlit as st
+
+from .diagnostics import get_metrics, profile_rerun
+from .files import init_environment
+from .ui.login import screen_login, screen_setup_admin
+from .ui.user import screen_user_dashboard
+from .users import load_db
+
+# CSS Personalizado
+CSS = """
+    <style>
+    .main-header {font-size: 2.5rem; color: #004E98; font-weight: 700;}
+    .sub-header {font-size: 1.5rem; color: #3A6EA5; margin-top: 1rem;}
+    .card {background-color: #f9f9f9; padding: 1.5rem; border-radius: 10px; border-left: 5px solid #004E98; margin-bottom: 1rem;}
+    .success-box {padding: 1rem; background-color: #d4edda; color: #155724; border-radius: 5px;}
+    .whatsapp-btn {
+        background-color: #25D366; color: white; padding: 5px 10px; border-radius: 5px; 
+        text-decoration: none; font-weight: bold; border: none;
+    }
+    .whatsapp-btn:hover {color: #fff; background-color: #128C7E;}
+    .cal-grid {width: 100%; border-collapse: collapse; margin-bottom: 1rem; text-align: center;}
+    .cal-grid th {color: #3A6EA5; font-weight: 600; padding: 4px;}
+    .cal-grid td {padding: 6px; border: 1px solid #eee;}
+    .cal-grid td.cal-evento {background-color: #e3edf9; color: #004E98; font-weight: 700;}
+    .cal-grid td.cal-hoje {outline: 2px solid #004E98;}
+    .delete-btn {
+        background-color: #ff4b4b; color: white; padding: 2px 8px; border-radius: 4px; font-size: 0.8em; text-decoration: none;
+    }
+    </style>
+"""
+
+# --- ORQUESTRADOR PRINCIPAL ---
+
+def main():
+    start = time.perf_counter()
+    try:
+        st.markdown(CSS, unsafe_allow_html=True)
+        if st.session_state.pop("_profile_next", False):
+            profile_rerun(render_app)
+        else:
+            render_app()
+    finally:
+        get_metrics().record("rerun", (time.perf_counter() - start) * 1000)
+
+def render_app():
+    init_environment()
+    df = load_db(['Telefone'])
+    
+    if df.empty:
+        screen_setup_admin()
+        return
+
+    if 'user' not in st.session_state or st.session_state['user'] is None:
+        screen_login()
+    else:
+        user = st.session_state['user']
+        if user.get('Role') == 'admin':
+            from .ui.admin import screen_admin_dashboard  # só a gestão carrega o painel completo
+
+            screen_admin_dashboard(user)
+        else:
+            screen_user_dashboard(user)
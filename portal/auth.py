@@ -0,0 +1,165 @@
+"""Segurança: codificação dos campos sensíveis, hash de senhas e limite de tentativas de login."""
+import os
+import re
+import time
+import hmac
+import base64
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from .util import clean_phone_number
+
+# --- SEGURANÇA ---
+def encrypt(text):
+    return base64.b64encode(str(text).encode()).decode() if text else ""
+
+def decrypt(text):
+    try:
+        return base64.b64decode(str(text).encode()).decode() if text else ""
+    except:
+        return text
+
+# Senhas: KDF com sal (scrypt; PBKDF2 se o OpenSSL não tiver scrypt).
+# Formatos gravados: "scrypt$n$r$p$sal$hash" e "pbkdf2_sha256$iteracoes$sal$hash".
+# Hashes SHA-256 antigos e senhas em texto puro ainda são aceitos no login e
+# regravados no formato atual assim que o usuário entra.
+KDF_TARGET_MS = int(os.environ.get("CORPORE_KDF_TARGET_MS", "250"))
+_LEGACY_HASH = re.compile(r"[0-9a-f]{64}")
+
+def _b64(raw):
+    return base64.b64encode(raw).decode()
+
+def _derive(scheme, params, password, salt):
+    password = str(password).encode()
+    if scheme == "scrypt":
+        n, r, p = params
+        return hashlib.scrypt(password, salt=salt, n=n, r=r, p=p, maxmem=256 * r * n, dklen=32)
+    return hashlib.pbkdf2_hmac("sha256", password, salt, params[0])
+
+def _time_kdf(scheme, params):
+    start = time.perf_counter()
+    _derive(scheme, params, "calibracao", b"\0" * 16)
+    return (time.perf_counter() - start) * 1000
+
+def calibrate_kdf(target_ms=KDF_TARGET_MS):
+    """Escolhe parâmetros do KDF para que uma verificação leve ~`target_ms` aqui.
+
+    Dobra o custo a partir de um mínimo razoável até atingir o alvo. Retorna
+    `(esquema, parametros)`.
+    """
+    if hasattr(hashlib, "scrypt"):
+        n, r, p = 2 ** 14, 8, 1
+        while n < 2 ** 17 and _time_kdf("scrypt", (n, r, p)) < target_ms / 2:
+            n *= 2
+        return "scrypt", (n, r, p)
+    iterations = 100_000
+    elapsed = _time_kdf("pbkdf2_sha256", (iterations,))
+    if elapsed < target_ms:
+        iterations = int(iterations * target_ms / max(elapsed, 1))
+    return "pbkdf2_sha256", (iterations,)
+
+@st.cache_resource
+def get_kdf_params():
+    """Parâmetros do KDF calibrados uma vez por processo."""
+    return calibrate_kdf()
+
+def hash_pass(password):
+    scheme, params = get_kdf_params()
+    salt = os.urandom(16)
+    digest = _derive(scheme, params, password, salt)
+    return "$".join([scheme, *map(str, params), _b64(salt), _b64(digest)])
+
+def _parse_hash(stored):
+    """`(esquema, parametros, sal, hash)` de um hash no formato atual, ou None."""
+    parts = str(stored).split("$")
+    try:
+        if parts[0] == "scrypt" and len(parts) == 6:
+            params = tuple(int(v) for v in parts[1:4])
+        elif parts[0] == "pbkdf2_sha256" and len(parts) == 4:
+            params = (int(parts[1]),)
+        else:
+            return None
+        return parts[0], params, base64.b64decode(parts[-2]), base64.b64decode(parts[-1])
+    except ValueError:
+        return None
+
+def is_password_hash(value):
+    """Valor já está na forma gravada (KDF atual ou SHA-256 legado)?"""
+    return _parse_hash(value) is not None or bool(_LEGACY_HASH.fullmatch(str(value)))
+
+def verify_pass(stored, provided):
+    parsed = _parse_hash(stored)
+    if parsed:
+        scheme, params, salt, digest = parsed
+        return hmac.compare_digest(_derive(scheme, params, provided, salt), digest)
+    if _LEGACY_HASH.fullmatch(str(stored)):
+        return hmac.compare_digest(stored, hashlib.sha256(str(provided).encode()).hexdigest())
+    return bool(stored) and hmac.compare_digest(str(stored).encode(), str(provided).encode())
+
+def needs_rehash(stored):
+    """Hash legado ou com custo abaixo do calibrado para este servidor."""
+    parsed = _parse_hash(stored)
+    if not parsed:
+        return True
+    scheme, params = get_kdf_params()
+    return parsed[0] != scheme or parsed[1] < params
+
+def check_login(stored, provided):
+    """Verifica a senha e, se correta e desatualizada, já calcula o novo hash.
+
+    Roda nas threads de `get_auth_executor()`. Retorna `(ok, novo_hash | None)`.
+    """
+    if not verify_pass(stored, provided):
+        return False, None
+    return True, hash_pass(provided) if needs_rehash(stored) else None
+
+@st.cache_resource
+def get_auth_executor():
+    """Threads dedicadas ao KDF; limitam quantas verificações rodam ao mesmo tempo."""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="corpore-auth")
+
+# Tentativas de login por telefone: bloqueio barato antes de qualquer KDF
+MAX_LOGIN_ATTEMPTS = 5
+LOGIN_WINDOW_SECONDS = 300
+
+class LoginThrottle:
+    """Contador de falhas por telefone numa janela deslizante, em memória."""
+
+    def __init__(self, max_attempts=MAX_LOGIN_ATTEMPTS, window=LOGIN_WINDOW_SECONDS):
+        self.max_attempts = max_attempts
+        self.window = window
+        self.lock = threading.Lock()
+        self.failures = {}  # telefone -> [instantes das falhas recentes]
+
+    def _recent(self, key, now):
+        recent = [t for t in self.failures.get(key, []) if now - t < self.window]
+        if recent:
+            self.failures[key] = recent
+        else:
+            self.failures.pop(key, None)
+        return recent
+
+    def retry_after(self, phone):
+        """Segundos até liberar o telefone; 0 se ainda pode tentar."""
+        key, now = clean_phone_number(phone), time.monotonic()
+        with self.lock:
+            recent = self._recent(key, now)
+            if len(recent) < self.max_attempts:
+                return 0
+            return int(self.window - (now - recent[-self.max_attempts])) + 1
+
+    def failed(self, phone):
+        key, now = clean_phone_number(phone), time.monotonic()
+        with self.lock:
+            self.failures[key] = self._recent(key, now) + [now]
+
+    def succeeded(self, phone):
+        with self.lock:
+            self.failures.pop(clean_phone_number(phone), None)
+
+@st.cache_resource
+def get_login_throttle():
+    return LoginThrottle()
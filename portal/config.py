@@ -0,0 +1,35 @@
+"""Configurações globais (caminhos, limites, colunas e opções das telas)."""
+import os
+
+# --- CONFIGURAÇÕES GLOBAIS ---
+FILE_DB = 'profissionais_db_secure.csv'
+FILE_SQLITE_DB = 'profissionais_db_secure.sqlite3'
+FILE_STATE_DB = 'corpore_estado.sqlite3'  # avisos e demais dados da aplicação
+STORAGE_BACKEND = os.environ.get("CORPORE_STORAGE", "sqlite")  # "sqlite" ou "csv"
+BASE_FILES_DIR = "corpore_docs"
+BLOBS_DIR = os.path.join(BASE_FILES_DIR, "_blobs")
+
+# Uploads: cópia em blocos com limites checados durante o streaming
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_UPLOAD_BYTES = int(os.environ.get("CORPORE_MAX_UPLOAD_MB", "25")) * 1024 * 1024
+USER_QUOTA_BYTES = int(os.environ.get("CORPORE_USER_QUOTA_MB", "500")) * 1024 * 1024
+MAX_ZIP_BYTES = int(os.environ.get("CORPORE_MAX_ZIP_MB", "200")) * 1024 * 1024  # "Baixar tudo" (montado em memória)
+
+# Campos Sensíveis (Criptografados)
+SENSITIVE_COLUMNS = ['Mãe', 'Email', 'Pix', 'Banco', 'Notificacao', 'Resumo', 'Nascimento'] 
+
+# Colunas do Banco de Dados
+ALL_COLUMNS = ['Telefone', 'Senha', 'Nome', 'Role', 'Unidade', 'Email', 'Pix', 'Banco', 'Disponibilidade', 'Data Cadastro', 'Notificacao', 'Resumo', 'Nascimento']
+UNIDADES_OPCOES = ["Corpore - São Mateus", "Corpore - Passos"]
+
+# Lista de profissionais (paginação no servidor)
+PAGE_SIZE_OPTIONS = [10, 25, 50, 100]
+LIST_SORT_COLUMNS = ['Nome', 'Unidade', 'Data Cadastro', 'Telefone']
+FILE_SORT_OPTIONS = {"Data": "mtime_ns", "Nome": "name", "Tamanho": "size"}
+
+# Snapshots (backups incrementais com hardlinks)
+SNAPSHOTS_DIR = os.environ.get("CORPORE_SNAPSHOTS_DIR", "corpore_snapshots")
+SNAPSHOT_KEEP = int(os.environ.get("CORPORE_SNAPSHOT_KEEP", "7"))
+
+# Intervalo (s) do polling de versões no painel do profissional
+CHANGE_POLL_SECONDS = 15
@@ -0,0 +1,101 @@
+"""Métricas de desempenho do processo e captura de perfis (cProfile)."""
+import io
+import time
+import threading
+import functools
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# --- DIAGNÓSTICO ---
+# Tempos das operações quentes e contadores de E/S, agregados no processo:
+# cada operação guarda só as últimas METRICS_WINDOW medições (buffer circular).
+METRICS_WINDOW = 500
+
+class Metrics:
+    """Buffers circulares de tempos (ms) por operação e contadores simples."""
+
+    def __init__(self, window=METRICS_WINDOW):
+        self.window = window
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.timings = {}
+            self.counters = {}
+            self.since = datetime.now()
+
+    def record(self, op, ms):
+        with self.lock:
+            if op not in self.timings:
+                self.timings[op] = deque(maxlen=self.window)
+            self.timings[op].append(ms)
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def summary(self):
+        """p50/p95/máximo por operação, das mais lentas (p95) para as mais rápidas."""
+        with self.lock:
+            timings = {op: np.array(buf) for op, buf in self.timings.items()}
+        rows = [
+            {"Operação": op, "Amostras": len(v), "p50 (ms)": round(float(np.percentile(v, 50)), 2),
+             "p95 (ms)": round(float(np.percentile(v, 95)), 2), "Máx (ms)": round(float(v.max()), 2)}
+            for op, v in timings.items()
+        ]
+        if not rows:
+            return pd.DataFrame(columns=["Operação", "Amostras", "p50 (ms)", "p95 (ms)", "Máx (ms)"])
+        return pd.DataFrame(rows).sort_values("p95 (ms)", ascending=False)
+
+    def counter_values(self):
+        with self.lock:
+            return dict(self.counters)
+
+@st.cache_resource
+def get_metrics():
+    """Métricas do processo (compartilhadas por todas as sessões)."""
+    return Metrics()
+
+def instrumented(func=None, *, name=None):
+    """Decorador que registra o tempo de cada chamada em `get_metrics()`."""
+    def decorate(func):
+        op = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                get_metrics().record(op, (time.perf_counter() - start) * 1000)
+        return wrapper
+    return decorate(func) if func else decorate
+
+def count_event(name, n=1):
+    get_metrics().count(name, n)
+
+def profile_rerun(run):
+    """Executa `run` sob o cProfile e guarda o perfil na sessão para download."""
+    import cProfile
+    import marshal
+    import pstats
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(run)
+    finally:
+        profiler.create_stats()
+        dados = marshal.dumps(profiler.stats)  # mesmo formato de Profile.dump_stats
+        resumo = io.StringIO()
+        pstats.Stats(profiler, stream=resumo).sort_stats("cumulative").print_stats(30)
+        st.session_state["_profile_data"] = {
+            "arquivo": f"corpore_{datetime.now():%Y%m%d_%H%M%S}.prof",
+            "dados": dados,
+            "resumo": resumo.getvalue(),
+        }
+    st.rerun()  # mostra o perfil recém-capturado
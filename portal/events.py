@@ -0,0 +1,252 @@
+"""Calendário de eventos da clínica: cadastro no banco de estado e visão mensal."""
+import calendar
+import html
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import streamlit as st
+
+from .diagnostics import instrumented
+from .storage import get_state_db
+
+# --- CALENDÁRIO ---
+# Eventos ficam na tabela `eventos` do banco de estado, indexada por data.
+# Um evento vale para todas as unidades (unidade vazia) ou para uma só, e
+# pode se repetir toda semana ou todo ano, opcionalmente até uma data final.
+# A tela consulta só o mês visível; a visão mensal fica em cache enquanto os
+# eventos daquele mês não mudam.
+
+RECURRENCE_LABELS = {"nenhuma": "Não se repete", "semanal": "Toda semana", "anual": "Todo ano"}
+MONTH_NAMES = ["Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
+               "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"]
+WEEKDAY_NAMES = ["Seg", "Ter", "Qua", "Qui", "Sex", "Sáb", "Dom"]
+EVENT_FIELDS = ("data", "titulo", "status", "unidade", "recorrencia", "ate", "destaque")
+
+# Calendário que era fixo no código (Dez/2025 - Jan/2026); vira o conteúdo inicial.
+DEFAULT_EVENTS = [
+    {"data": "2025-12-12", "titulo": "🎉 Confraternização", "status": "Confirmado"},
+    {"data": "2025-12-22", "titulo": "🛑 Início Recesso", "status": "Fechado", "destaque": 1},
+    {"data": "2025-12-25", "titulo": "🎄 Natal", "status": "Feriado", "recorrencia": "anual"},
+    {"data": "2026-01-01", "titulo": "🎆 Ano Novo", "status": "Feriado", "recorrencia": "anual"},
+    {"data": "2026-01-04", "titulo": "🔚 Fim do Recesso", "status": "Retorno dia 05", "destaque": 1},
+    {"data": "2026-01-05", "titulo": "✅ Retorno Atividades", "status": "Normal"},
+]
+
+def _clean_event(fields):
+    """Valida e normaliza os campos de um evento (ValueError com a mensagem para a tela)."""
+    event = {
+        "data": str(fields.get("data") or ""),
+        "titulo": (fields.get("titulo") or "").strip(),
+        "status": (fields.get("status") or "").strip(),
+        "unidade": fields.get("unidade") or "",
+        "recorrencia": fields.get("recorrencia") or "nenhuma",
+        "ate": str(fields.get("ate") or ""),
+        "destaque": 1 if fields.get("destaque") else 0,
+    }
+    if not event["titulo"]:
+        raise ValueError("Informe o título do evento.")
+    if event["recorrencia"] not in RECURRENCE_LABELS:
+        raise ValueError(f"Repetição inválida: {event['recorrencia']}.")
+    try:
+        first = date.fromisoformat(event["data"])
+        last = date.fromisoformat(event["ate"]) if event["ate"] else None
+    except ValueError:
+        raise ValueError("Data inválida.") from None
+    if event["recorrencia"] == "nenhuma":
+        event["ate"] = ""
+    elif last is not None and last < first:
+        raise ValueError("A repetição termina antes da primeira data.")
+    return event
+
+class EventStore:
+    """Eventos do calendário (SQLite, modo WAL)."""
+
+    def __init__(self, db):
+        self.db = db
+        db.register("eventos", self._create_schema)
+
+    def _create_schema(self, conn):
+        created = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'eventos'").fetchone() is None
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS eventos ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT, data TEXT NOT NULL, titulo TEXT NOT NULL,"
+            " status TEXT NOT NULL DEFAULT '', unidade TEXT NOT NULL DEFAULT '',"
+            " recorrencia TEXT NOT NULL DEFAULT 'nenhuma', ate TEXT NOT NULL DEFAULT '',"
+            " destaque INTEGER NOT NULL DEFAULT 0, atualizado_em TEXT NOT NULL DEFAULT '')"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_eventos_data ON eventos (recorrencia, data)")
+        if created:
+            for event in DEFAULT_EVENTS:
+                self._insert(conn, event)
+
+    def _insert(self, conn, fields):
+        event = _clean_event(fields)
+        cur = conn.execute(
+            f"INSERT INTO eventos ({', '.join(EVENT_FIELDS)}, atualizado_em) VALUES ({', '.join('?' * (len(EVENT_FIELDS) + 1))})",
+            [event[k] for k in EVENT_FIELDS] + [datetime.now().strftime("%Y-%m-%d %H:%M")],
+        )
+        return cur.lastrowid
+
+    def add(self, fields):
+        """Cadastra um evento. Retorna o id."""
+        conn = self.db.connect()
+        try:
+            with conn:
+                return self._insert(conn, fields)
+        finally:
+            conn.close()
+
+    def update(self, event_id, fields):
+        event = _clean_event(fields)
+        conn = self.db.connect()
+        try:
+            with conn:
+                conn.execute(
+                    f"UPDATE eventos SET {', '.join(f'{k} = ?' for k in EVENT_FIELDS)}, atualizado_em = ? WHERE id = ?",
+                    [event[k] for k in EVENT_FIELDS] + [datetime.now().strftime("%Y-%m-%d %H:%M"), event_id],
+                )
+        finally:
+            conn.close()
+
+    def delete(self, event_id):
+        conn = self.db.connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM eventos WHERE id = ?", (event_id,))
+        finally:
+            conn.close()
+
+    def get(self, event_id):
+        conn = self.db.connect()
+        try:
+            row = conn.execute("SELECT * FROM eventos WHERE id = ?", (event_id,)).fetchone()
+            return dict(row) if row else None
+        finally:
+            conn.close()
+
+    def between(self, start, end, unit=None):
+        """Eventos com alguma ocorrência possível entre `start` e `end` (datas, inclusive).
+
+        Eventos únicos são filtrados pelo índice de data; os recorrentes,
+        pelo intervalo entre a primeira data e o fim da repetição. Com
+        `unit`, só os eventos gerais e os daquela unidade.
+        """
+        sql = (
+            "SELECT * FROM eventos WHERE ("
+            " (recorrencia = 'nenhuma' AND data BETWEEN ? AND ?)"
+            " OR (recorrencia != 'nenhuma' AND data <= ? AND (ate = '' OR ate >= ?))"
+            ")"
+        )
+        params = [start.isoformat(), end.isoformat(), end.isoformat(), start.isoformat()]
+        if unit is not None:
+            sql += " AND unidade IN ('', ?)"
+            params.append(unit)
+        conn = self.db.connect()
+        try:
+            return [dict(row) for row in conn.execute(sql + " ORDER BY data, id", params)]
+        finally:
+            conn.close()
+
+    def listing(self, since=None):
+        """Todos os eventos por data; com `since`, só os que ainda têm ocorrências a partir dela."""
+        sql = "SELECT * FROM eventos"
+        params = []
+        if since is not None:
+            sql += " WHERE (recorrencia = 'nenhuma' AND data >= ?) OR (recorrencia != 'nenhuma' AND (ate = '' OR ate >= ?))"
+            params = [since.isoformat(), since.isoformat()]
+        conn = self.db.connect()
+        try:
+            return [dict(row) for row in conn.execute(sql + " ORDER BY data, id", params)]
+        finally:
+            conn.close()
+
+def occurrences(event, start, end):
+    """Datas em que `event` acontece entre `start` e `end` (inclusive)."""
+    first = date.fromisoformat(event["data"])
+    last = min(end, date.fromisoformat(event["ate"])) if event["ate"] else end
+    if event["recorrencia"] == "semanal":
+        day = first
+        if day < start:
+            day += timedelta(days=-(-(start - first).days // 7) * 7)
+        while day <= last:
+            yield day
+            day += timedelta(days=7)
+    elif event["recorrencia"] == "anual":
+        for year in range(max(first.year, start.year), last.year + 1):
+            try:
+                day = first.replace(year=year)
+            except ValueError:  # 29/02 fora de ano bissexto
+                continue
+            if start <= day <= last:
+                yield day
+    elif start <= first <= last:
+        yield first
+
+def month_range(month):
+    """Primeiro e último dia do mês de `month`."""
+    first = month.replace(day=1)
+    return first, first.replace(day=calendar.monthrange(first.year, first.month)[1])
+
+def format_recurrence(event):
+    label = RECURRENCE_LABELS.get(event["recorrencia"], event["recorrencia"])
+    if event["recorrencia"] != "nenhuma" and event["ate"]:
+        label += f" até {date.fromisoformat(event['ate']):%d/%m/%Y}"
+    return label
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _render_month(year, month, rows, today):
+    """Grade HTML, tabela e destaques do mês; `rows` são os eventos do intervalo.
+
+    A chave do cache é o próprio conteúdo dos eventos do mês (e o dia de
+    hoje, marcado na grade): alterar um evento de outro mês não invalida
+    esta visão.
+    """
+    start, end = month_range(date(year, month, 1))
+    items = sorted(
+        ((day, event) for event in map(dict, rows) for day in occurrences(event, start, end)),
+        key=lambda item: (item[0], item[1]["id"]),
+    )
+    by_day = {}
+    for day, event in items:
+        by_day.setdefault(day.day, []).append(event["titulo"])
+
+    cells = []
+    for week in calendar.Calendar().monthdayscalendar(year, month):
+        tds = []
+        for day in week:
+            if not day:
+                tds.append("<td></td>")
+                continue
+            classes = []
+            if day in by_day:
+                classes.append("cal-evento")
+            if date(year, month, day) == today:
+                classes.append("cal-hoje")
+            titles = html.escape(" • ".join(by_day.get(day, [])), quote=True)
+            tds.append(f'<td class="{" ".join(classes)}" title="{titles}">{day}</td>')
+        cells.append(f"<tr>{''.join(tds)}</tr>")
+    header = "".join(f"<th>{name}</th>" for name in WEEKDAY_NAMES)
+    grid = f'<table class="cal-grid"><tr>{header}</tr>{"".join(cells)}</table>'
+
+    table = pd.DataFrame(
+        [
+            {"Data": day.strftime("%d/%m/%Y"), "Dia": WEEKDAY_NAMES[day.weekday()],
+             "Evento": event["titulo"], "Status": event["status"], "Unidade": event["unidade"] or "Todas"}
+            for day, event in items
+        ],
+        columns=["Data", "Dia", "Evento", "Status", "Unidade"],
+    )
+    highlights = [(day.strftime("%d/%m"), event["titulo"], event["status"]) for day, event in items if event["destaque"]]
+    return grid, table, highlights
+
+@instrumented
+def month_view(month, unit=None):
+    """Visão mensal para `unit`: consulta só o mês e reaproveita a renderização em cache."""
+    start, end = month_range(month)
+    rows = tuple(tuple(event.items()) for event in get_events().between(start, end, unit))
+    return _render_month(start.year, start.month, rows, date.today())
+
+@st.cache_resource
+def get_events():
+    """Calendário de eventos do processo."""
+    return EventStore(get_state_db())
@@ -0,0 +1,617 @@
+"""Arquivos dos profissionais: pastas, uploads, manifestos, blobs, prévias e ZIPs."""
+import os
+import re
+import io
+import json
+import shutil
+import zipfile
+import hashlib
+import tempfile
+import threading
+import mimetypes
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import streamlit as st
+
+from .config import BASE_FILES_DIR, BLOBS_DIR, MAX_UPLOAD_BYTES, UPLOAD_CHUNK_SIZE, USER_QUOTA_BYTES
+from .diagnostics import count_event, instrumented
+from .util import clean_phone_number
+
+# --- PASTAS E UPLOADS ---
+
+@st.cache_resource
+def init_environment():
+    """Garante que pastas e arquivos essenciais existam (uma vez por processo)."""
+    os.makedirs(BASE_FILES_DIR, exist_ok=True)
+
+def ensure_user_dirs(identifier):
+    """Cria pastas isoladas para cada usuário usando o Telefone como ID."""
+    clean_id = clean_phone_number(identifier)
+    user_root = os.path.join(BASE_FILES_DIR, clean_id)
+    inbox = os.path.join(user_root, "recebidos_gestao") 
+    outbox = os.path.join(user_root, "enviados_usuario") 
+    
+    if not (os.path.isdir(inbox) and os.path.isdir(outbox)):  # caso comum: dois stats
+        os.makedirs(inbox, exist_ok=True)
+        os.makedirs(outbox, exist_ok=True)
+    return inbox, outbox
+
+def rename_user_dir(old_phone, new_phone):
+    """Renomeia a pasta de arquivos se o telefone mudar."""
+    old_id = clean_phone_number(old_phone)
+    new_id = clean_phone_number(new_phone)
+    
+    old_path = os.path.join(BASE_FILES_DIR, old_id)
+    new_path = os.path.join(BASE_FILES_DIR, new_id)
+    
+    if os.path.exists(old_path):
+        os.rename(old_path, new_path)
+    else:
+        ensure_user_dirs(new_phone)
+
+def delete_user_dir(phone, progress=None):
+    """Apaga a pasta de arquivos do usuário (arquivo a arquivo se houver `progress`)."""
+    clean_id = clean_phone_number(phone)
+    path = os.path.join(BASE_FILES_DIR, clean_id)
+    if not clean_id or not os.path.exists(path):
+        return
+    shared = _linked_blobs(os.path.join(path, "recebidos_gestao"))
+    if progress is None:
+        shutil.rmtree(path)
+    else:
+        entries = list(os.walk(path, topdown=False))
+        total = max(sum(len(files) for _, _, files in entries), 1)
+        done = 0
+        for root, dirs, files in entries:
+            for name in files:
+                os.remove(os.path.join(root, name))
+                done += 1
+                progress(done / total, f"{done} de {total} arquivo(s) removido(s)")
+            os.rmdir(root)
+    release_blobs(shared)
+
+class UploadLimitError(Exception):
+    """Upload acima do limite por arquivo ou da cota do usuário."""
+
+def _user_usage(user_root):
+    """Bytes já ocupados pela pasta de um usuário (somados dos manifestos)."""
+    if not os.path.isdir(user_root):
+        return 0
+    with os.scandir(user_root) as entries:
+        return sum(folder_total(entry.path) for entry in entries if entry.is_dir(follow_symlinks=False))
+
+def _fsync_dir(path):
+    """Garante que o rename dentro de `path` sobreviva a uma queda."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def _format_mb(num_bytes):
+    return f"{num_bytes / (1024 * 1024):.1f} MB"
+
+def _stream_to_temp(uploaded_file, folder, limit, limit_error):
+    """Copia o upload em blocos para um temporário oculto em `folder`.
+
+    Calcula o SHA-256 durante a cópia e aborta com `limit_error()` assim que
+    `limit` bytes forem ultrapassados. Retorna (caminho temporário, sha256).
+    """
+    declared = getattr(uploaded_file, "size", None)
+    if declared is not None and declared > limit:
+        raise limit_error()
+
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=".upload-")
+    try:
+        digest = hashlib.sha256()
+        written = 0
+        if hasattr(uploaded_file, "seek"):
+            uploaded_file.seek(0)
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = uploaded_file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if written > limit:
+                    raise limit_error()
+                digest.update(chunk)
+                out.write(chunk)
+            out.flush()
+            os.fsync(out.fileno())
+        count_event("bytes_gravados", written)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return tmp_path, digest.hexdigest()
+
+def _file_limit_error(max_bytes):
+    return lambda: UploadLimitError(f"Arquivo maior que o limite de {_format_mb(max_bytes)}.")
+
+@instrumented
+def save_uploaded_file(uploaded_file, target_folder, max_bytes=None, quota_bytes=None, uploader=""):
+    """Copia o upload em blocos para um temporário e só então o publica.
+
+    O SHA-256 é calculado durante a cópia e os limites (por arquivo e cota
+    da pasta do usuário, pai de `target_folder`) são checados a cada bloco.
+    O arquivo final só aparece após fsync + rename, nunca pela metade.
+    Retorna o SHA-256 do conteúdo, ou False em caso de erro.
+    """
+    max_bytes = MAX_UPLOAD_BYTES if max_bytes is None else max_bytes
+    quota_bytes = USER_QUOTA_BYTES if quota_bytes is None else quota_bytes
+    try:
+        os.makedirs(target_folder, exist_ok=True)
+        available = quota_bytes - _user_usage(os.path.dirname(os.path.normpath(target_folder)))
+        if available < max_bytes:
+            limit = available
+            limit_error = lambda: UploadLimitError(f"Cota de armazenamento excedida (disponível: {_format_mb(max(available, 0))}).")
+        else:
+            limit, limit_error = max_bytes, _file_limit_error(max_bytes)
+
+        tmp_path, sha = _stream_to_temp(uploaded_file, target_folder, limit, limit_error)
+        filename = os.path.basename(uploaded_file.name)
+        try:
+            os.replace(tmp_path, os.path.join(target_folder, filename))
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        _fsync_dir(target_folder)
+        record_file(target_folder, filename, sha, uploader)
+        schedule_preview(os.path.join(target_folder, filename), sha)
+        return sha
+    except UploadLimitError as e:
+        st.error(str(e))
+        return False
+    except Exception as e:
+        st.error(f"Erro ao salvar arquivo: {e}")
+        return False
+
+@instrumented
+def delete_file(folder, filename):
+    """Exclui um arquivo específico."""
+    try:
+        file_path = os.path.join(folder, filename)
+        if os.path.exists(file_path):
+            shared = _linked_blobs(folder, filename)
+            os.remove(file_path)
+            forget_file(folder, filename)
+            release_blobs(shared)
+            return True
+        return False
+    except Exception as e:
+        st.error(f"Erro ao excluir: {e}")
+        return False
+
+@instrumented
+def get_files(directory):
+    return [f['name'] for f in list_files(directory)]
+
+# --- MANIFESTO DE ARQUIVOS ---
+# Cada pasta de usuário tem um manifesto (tamanho, mtime, sha256, quem enviou)
+# gravado ao lado dela, em `.manifest-<pasta>.json`. Uploads e exclusões o
+# atualizam diretamente; a pasta só é varrida de novo (os.scandir) quando o
+# mtime dela não bate com o registrado, e os hashes de arquivos inalterados
+# são reaproveitados.
+
+@st.cache_resource
+def manifest_cache():
+    """Manifestos já carregados, por pasta, compartilhados pelo processo."""
+    return {"lock": threading.RLock(), "dirs": {}}
+
+def _manifest_path(directory):
+    directory = os.path.normpath(directory)
+    return os.path.join(os.path.dirname(directory), f".manifest-{os.path.basename(directory)}.json")
+
+def _hash_file(path):
+    digest = hashlib.sha256()
+    read = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(UPLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+            read += len(chunk)
+    count_event("bytes_lidos", read)
+    return digest.hexdigest()
+
+def _dir_mtime(directory):
+    try:
+        return os.stat(directory).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def _write_manifest(directory, manifest):
+    path = _manifest_path(directory)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+@instrumented
+def _scan_manifest(directory, previous):
+    """Revalida o manifesto com os.scandir, reaproveitando entradas inalteradas."""
+    old_files = previous.get("files", {}) if previous else {}
+    files = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.startswith('.') or not entry.is_file(follow_symlinks=False):
+                continue
+            stat = entry.stat(follow_symlinks=False)
+            known = old_files.get(entry.name)
+            if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+                files[entry.name] = known
+            else:
+                files[entry.name] = {
+                    "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                    "sha256": _hash_file(entry.path), "uploader": (known or {}).get("uploader", ""),
+                }
+    return {"dir_mtime_ns": _dir_mtime(directory), "files": files}
+
+def _load_manifest(directory):
+    """Manifesto em cache (memória ou disco), sem revalidar a pasta."""
+    manifest = manifest_cache()["dirs"].get(os.path.normpath(directory))
+    if manifest is None:
+        try:
+            with open(_manifest_path(directory), encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, ValueError):
+            manifest = None
+    return manifest
+
+def get_manifest(directory):
+    """Manifesto da pasta; custa um stat quando nada mudou."""
+    cache = manifest_cache()
+    key = os.path.normpath(directory)
+    with cache["lock"]:
+        mtime = _dir_mtime(directory)
+        if mtime is None:
+            cache["dirs"].pop(key, None)
+            return {"dir_mtime_ns": None, "files": {}}
+        manifest = _load_manifest(directory)
+        if manifest is None or manifest.get("dir_mtime_ns") != mtime:
+            manifest = _scan_manifest(directory, manifest)
+            _write_manifest(directory, manifest)
+        cache["dirs"][key] = manifest
+        return manifest
+
+def _update_manifest(directory, change):
+    """Aplica `change(files)` ao manifesto em cache e registra o novo mtime da pasta.
+
+    Quem chama acabou de gravar ou excluir o arquivo: o mtime mudou por
+    causa dessa operação, então a pasta não é varrida de novo. Só sem
+    nenhum manifesto salvo a pasta é varrida (uma vez).
+    """
+    cache = manifest_cache()
+    with cache["lock"]:
+        manifest = _load_manifest(directory) or get_manifest(directory)
+        change(manifest["files"])
+        manifest["dir_mtime_ns"] = _dir_mtime(directory)
+        cache["dirs"][os.path.normpath(directory)] = manifest
+        _write_manifest(directory, manifest)
+
+def record_file(directory, filename, sha256=None, uploader=""):
+    """Registra no manifesto um arquivo recém-gravado em `directory`."""
+    path = os.path.join(directory, filename)
+    stat = os.stat(path)
+    entry = {
+        "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+        "sha256": sha256 or _hash_file(path), "uploader": uploader or "",
+    }
+    _update_manifest(directory, lambda files: files.__setitem__(filename, entry))
+
+def forget_file(directory, filename):
+    """Remove do manifesto um arquivo excluído de `directory`."""
+    _update_manifest(directory, lambda files: files.pop(filename, None))
+
+def list_files(directory, sort_by="mtime_ns", descending=True, contains=None):
+    """Arquivos da pasta com metadados, ordenados e filtrados sem varrer o disco."""
+    with manifest_cache()["lock"]:  # uploads e exclusões alteram o dict no lugar
+        items = list(get_manifest(directory)["files"].items())
+    files = [{"name": name, **meta} for name, meta in items]
+    if contains:
+        needle = contains.lower()
+        files = [f for f in files if needle in f["name"].lower()]
+    key = (lambda f: f["name"].lower()) if sort_by == "name" else (lambda f: f[sort_by])
+    return sorted(files, key=key, reverse=descending)
+
+def folder_total(directory):
+    with manifest_cache()["lock"]:
+        return sum(meta["size"] for meta in get_manifest(directory)["files"].values())
+
+def user_storage(phone):
+    """Bytes ocupados por um usuário: (recebidos da gestão, enviados pelo usuário)."""
+    root = os.path.join(BASE_FILES_DIR, clean_phone_number(phone))
+    return folder_total(os.path.join(root, "recebidos_gestao")), folder_total(os.path.join(root, "enviados_usuario"))
+
+def file_caption(meta):
+    """Linha de detalhes (tamanho, data, autor) exibida abaixo do nome do arquivo."""
+    sent_at = datetime.fromtimestamp(meta['mtime_ns'] / 1e9).strftime("%d/%m/%Y %H:%M")
+    caption = f"{format_size(meta['size'])} · {sent_at}"
+    if meta.get('uploader'):
+        caption += f" · {meta['uploader']}"
+    return caption
+
+def format_size(num_bytes):
+    for unit in ("B", "KB", "MB"):
+        if num_bytes < 1024:
+            return f"{num_bytes:.0f} {unit}" if unit == "B" else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} GB"
+
+def lazy_file(path):
+    """Conteúdo para st.download_button lido só quando o download é pedido."""
+    def read():
+        with open(path, "rb") as f:
+            data = f.read()
+        count_event("downloads")
+        count_event("bytes_lidos", len(data))
+        return data
+    return read
+
+def guess_mime(filename):
+    return mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+# --- ARQUIVOS COMPARTILHADOS (BLOBS) ---
+# Cada conteúdo é gravado uma única vez em BLOBS_DIR, com o SHA-256 como nome.
+# As caixas de entrada recebem hardlinks para o blob: enviar para N pessoas
+# ocupa o espaço de um arquivo, e apagar a cópia de um usuário só remove o
+# link dele. Ao excluir, release_blobs() confere só os blobs daquela cópia e
+# recolhe os que ficaram sem nenhum link. Envios e recolhimentos passam pelo
+# mesmo lock: um blob recém-gravado ainda não tem links e não pode ser
+# recolhido antes de chegar às caixas de entrada.
+
+@st.cache_resource
+def get_blob_lock():
+    """Um envio ou recolhimento de blobs por vez no processo."""
+    return threading.Lock()
+
+def blob_path(sha):
+    return os.path.join(BLOBS_DIR, sha[:2], sha)
+
+def store_blob(uploaded_file, max_bytes=None):
+    """Grava o conteúdo no repositório de blobs (deduplicado). Retorna o SHA-256."""
+    max_bytes = MAX_UPLOAD_BYTES if max_bytes is None else max_bytes
+    os.makedirs(BLOBS_DIR, exist_ok=True)
+    tmp_path, sha = _stream_to_temp(uploaded_file, BLOBS_DIR, max_bytes, _file_limit_error(max_bytes))
+    target = blob_path(sha)
+    try:
+        if os.path.exists(target):
+            os.remove(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.chmod(tmp_path, 0o444)  # conteúdo compartilhado: nunca editar no lugar
+            os.replace(tmp_path, target)
+            _fsync_dir(os.path.dirname(target))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return sha
+
+def link_blob(sha, target_folder, filename, uploader=""):
+    """Publica o blob em `target_folder/filename` (hardlink; cópia se o FS não suportar).
+
+    Retorna os blobs da cópia substituída (mesmo nome, outro conteúdo), que o
+    chamador recolhe com release_blobs() depois de soltar o lock de blobs.
+    """
+    os.makedirs(target_folder, exist_ok=True)
+    replaced = _linked_blobs(target_folder, os.path.basename(filename)) - {sha}
+    final_path = os.path.join(target_folder, os.path.basename(filename))
+    tmp_path = os.path.join(target_folder, f".link-{sha[:16]}-{threading.get_ident()}")
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    try:
+        os.link(blob_path(sha), tmp_path)
+    except OSError:
+        shutil.copyfile(blob_path(sha), tmp_path)
+    os.replace(tmp_path, final_path)
+    record_file(target_folder, os.path.basename(filename), sha, uploader)
+    return replaced
+
+@instrumented
+def send_file_to_users(uploaded_file, phones, uploader=""):
+    """Envia um arquivo para as caixas de entrada de vários profissionais.
+
+    O conteúdo é armazenado uma vez; cada caixa recebe só uma referência.
+    Retorna quantos profissionais receberam o arquivo, ou False em caso de erro.
+    """
+    sha = None
+    try:
+        count = 0
+        replaced = set()
+        with get_blob_lock():
+            sha = store_blob(uploaded_file)
+            for phone in phones:
+                inbox, _ = ensure_user_dirs(phone)
+                replaced |= link_blob(sha, inbox, uploaded_file.name, uploader)
+                count += 1
+        release_blobs(replaced)  # versões anteriores sobrescritas nas caixas
+        schedule_preview(blob_path(sha), sha, uploaded_file.name)
+        return count
+    except UploadLimitError as e:
+        st.error(str(e))
+        return False
+    except Exception as e:
+        if sha:
+            release_blobs({sha})  # envio interrompido: não deixa blob órfão
+        st.error(f"Erro ao enviar arquivo: {e}")
+        return False
+
+def _linked_blobs(folder, filename=None):
+    """SHA-256 dos arquivos de `folder` (ou só de `filename`) que são links de blobs."""
+    with manifest_cache()["lock"]:
+        files = get_manifest(folder)["files"]
+        metas = [files.get(filename, {})] if filename is not None else list(files.values())
+    return {meta["sha256"] for meta in metas if meta.get("sha256") and os.path.exists(blob_path(meta["sha256"]))}
+
+def release_blobs(shas):
+    """Recolhe, dentre `shas`, os blobs que ficaram sem nenhum link. Retorna quantos."""
+    removed = 0
+    with get_blob_lock():
+        for sha in shas:
+            try:
+                if os.stat(blob_path(sha)).st_nlink == 1:
+                    os.remove(blob_path(sha))
+                    removed += 1
+            except FileNotFoundError:
+                pass
+    return removed
+
+# --- PRÉVIAS (MINIATURAS) ---
+# Miniaturas JPEG geradas uma vez por conteúdo (SHA-256) numa thread à parte
+# e guardadas em PREVIEWS_DIR. Pillow gera as de imagens; PDFs só têm prévia
+# se o pypdfium2 (opcional) estiver instalado.
+PREVIEWS_DIR = os.path.join(BASE_FILES_DIR, "_previews")
+PREVIEW_MAX_SIZE = (320, 320)
+PREVIEW_QUALITY = 70
+
+def preview_path(sha):
+    return os.path.join(PREVIEWS_DIR, sha[:2], f"{sha}.jpg")
+
+def _no_preview_marker(sha):
+    """Marca conteúdos que não geram prévia (corrompidos etc.) para não tentar de novo."""
+    return os.path.join(PREVIEWS_DIR, sha[:2], f"{sha}.sem-previa")
+
+@st.cache_resource
+def preview_extensions():
+    """Extensões com prévia possível neste servidor (conforme as bibliotecas instaladas)."""
+    extensions = set()
+    try:
+        import PIL.Image  # noqa: F401
+    except ImportError:
+        return extensions
+    extensions.update({".jpg", ".jpeg", ".png"})
+    try:
+        import pypdfium2  # noqa: F401
+        extensions.add(".pdf")
+    except ImportError:
+        pass
+    return extensions
+
+def _open_preview_source(path, ext):
+    if ext == ".pdf":
+        import pypdfium2 as pdfium
+
+        pdf = pdfium.PdfDocument(path)
+        try:
+            page = pdf[0]
+            scale = min(PREVIEW_MAX_SIZE[0] / page.get_width(), PREVIEW_MAX_SIZE[1] / page.get_height())
+            return page.render(scale=scale).to_pil()
+        finally:
+            pdf.close()
+    from PIL import Image
+
+    return Image.open(path)
+
+def make_preview(path, sha, ext=None):
+    """Gera a miniatura de `path` (conteúdo `sha`). Retorna o caminho dela ou None."""
+    target = preview_path(sha)
+    if os.path.exists(target):
+        return target
+    ext = (ext or os.path.splitext(path)[1]).lower()
+    if ext not in preview_extensions() or os.path.exists(_no_preview_marker(sha)):
+        return None
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    try:
+        with _open_preview_source(path, ext) as image:
+            image.draft("RGB", PREVIEW_MAX_SIZE)  # JPEG: decodifica já reduzido
+            image.thumbnail(PREVIEW_MAX_SIZE)
+            thumb = image.convert("RGB")
+    except Exception:
+        open(_no_preview_marker(sha), "w").close()
+        return None
+    tmp_path = f"{target}.{threading.get_ident()}.tmp"
+    thumb.save(tmp_path, "JPEG", quality=PREVIEW_QUALITY, optimize=True)
+    os.replace(tmp_path, target)
+    count_event("previas_geradas")
+    return target
+
+@st.cache_resource
+def get_preview_worker():
+    """Uma thread para gerar prévias e o conjunto das que já estão na fila."""
+    return {"executor": ThreadPoolExecutor(max_workers=1, thread_name_prefix="corpore-previa"),
+            "pending": set(), "lock": threading.Lock()}
+
+def schedule_preview(path, sha, filename=None):
+    """Agenda a geração da prévia, se fizer sentido e ainda não existir."""
+    ext = os.path.splitext(filename or path)[1].lower()
+    if not sha or ext not in preview_extensions():
+        return
+    if os.path.exists(preview_path(sha)) or os.path.exists(_no_preview_marker(sha)):
+        return
+    worker = get_preview_worker()
+    with worker["lock"]:
+        if sha in worker["pending"]:
+            return
+        worker["pending"].add(sha)
+
+    def run():
+        try:
+            make_preview(path, sha, ext)
+        finally:
+            with worker["lock"]:
+                worker["pending"].discard(sha)
+
+    worker["executor"].submit(run)
+
+def cached_preview(directory, meta):
+    """Miniatura já gerada do arquivo do manifesto, ou None (e agenda a geração)."""
+    sha = meta.get("sha256")
+    if not sha:
+        return None
+    path = preview_path(sha)
+    if os.path.exists(path):
+        return path
+    schedule_preview(os.path.join(directory, meta['name']), sha)
+    return None
+
+# --- PACOTES ZIP ("Baixar tudo") ---
+# O ZIP é montado num buffer em memória, direto dos arquivos das pastas. O
+# tamanho somado nos manifestos é conferido antes de oferecer o download:
+# acima de MAX_ZIP_BYTES o botão fica desabilitado.
+# Formatos já comprimidos vão sem recompressão (ZIP_STORED).
+ZIP_STORED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".pdf", ".zip", ".xlsx", ".docx"}
+USER_FOLDERS = ("recebidos_gestao", "enviados_usuario")
+
+def build_zip(entries):
+    """Bytes de um ZIP com os arquivos `(caminho, nome no pacote)` de `entries`."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for path, arcname in entries:
+            stored = os.path.splitext(arcname)[1].lower() in ZIP_STORED_EXTENSIONS
+            archive.write(path, arcname, compress_type=zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED)
+            count_event("bytes_lidos", os.path.getsize(path))
+    return buffer.getvalue()
+
+def archive_name(text):
+    return re.sub(r'[\\/:*?"<>|]+', "-", str(text)).strip() or "sem_nome"
+
+def user_archive_entries(phone, prefix=""):
+    root = os.path.join(BASE_FILES_DIR, clean_phone_number(phone))
+    for folder in USER_FOLDERS:
+        directory = os.path.join(root, folder)
+        if not os.path.isdir(directory):
+            continue
+        for meta in list_files(directory, sort_by="name", descending=False):
+            yield os.path.join(directory, meta['name']), f"{prefix}{folder}/{meta['name']}"
+
+def user_archive(phone):
+    """ZIP com as duas pastas do profissional."""
+    return build_zip(user_archive_entries(phone))
+
+def group_archive(people):
+    """ZIP com as pastas de vários profissionais (pares telefone, nome), um diretório por pessoa."""
+    entries = (
+        entry
+        for phone, nome in people
+        for entry in user_archive_entries(phone, prefix=f"{archive_name(nome)} ({clean_phone_number(phone)})/")
+    )
+    return build_zip(entries)
+
+def group_storage(phones):
+    """Bytes somados (pelos manifestos) das pastas de vários profissionais."""
+    return sum(sum(user_storage(phone)) for phone in phones)
@@ -0,0 +1,245 @@
+"""Estruturas derivadas do cadastro: indicadores do painel, busca e aniversários."""
+import re
+import math
+import bisect
+import calendar
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from .auth import decrypt
+from .users import find_users, get_repository
+from .util import clean_phone_number, fold_text
+
+# --- INDICADORES DO PAINEL ---
+SIGNUP_CHART_DAYS = 90
+
+class DashboardStats:
+    """Contadores da Visão Geral mantidos pelas escritas do repositório.
+
+    `by_unit` e `by_day` contam todos os cadastros (como a tabela sempre
+    contou); `professionals` exclui administradores.
+    """
+
+    COLUMNS = {'Role', 'Unidade', 'Data Cadastro'}
+
+    def __init__(self, frame=None):
+        self.professionals = 0
+        self.by_unit = {}
+        self.by_day = {}
+        if frame is not None:
+            for role, unit, day in frame[['Role', 'Unidade', 'Data Cadastro']].itertuples(index=False):
+                self._count(role, unit, day, 1)
+
+    @staticmethod
+    def _bump(counter, key, delta):
+        value = counter.get(key, 0) + delta
+        if value:
+            counter[key] = value
+        else:
+            counter.pop(key, None)
+
+    def _count(self, role, unit, day, delta):
+        if role != 'admin':
+            self.professionals += delta
+        self._bump(self.by_unit, unit, delta)
+        self._bump(self.by_day, day, delta)
+
+    # Interface usada pelo UserRepository (linhas na forma gravada)
+    def add(self, row):
+        self._count(row['Role'], row['Unidade'], row['Data Cadastro'], 1)
+
+    def discard(self, row):
+        self._count(row['Role'], row['Unidade'], row['Data Cadastro'], -1)
+
+    def signups_on(self, day):
+        return self.by_day.get(day.strftime("%Y-%m-%d"), 0)
+
+    def units_chart(self):
+        return pd.Series(self.by_unit, name="count").sort_values(ascending=False)
+
+    def signups_chart(self, days=SIGNUP_CHART_DAYS, today=None):
+        """Cadastros por dia nos últimos `days` dias (dias sem cadastro valem 0)."""
+        today = today or date.today()
+        index = pd.date_range(today - timedelta(days=days - 1), today, freq="D")
+        counts = pd.Series(self.by_day, dtype="int64")
+        counts.index = pd.to_datetime(counts.index, format="%Y-%m-%d", errors="coerce")
+        counts = counts[counts.index.notna()].groupby(level=0).sum()
+        return counts.reindex(index, fill_value=0).rename("Cadastros")
+
+def get_dashboard_stats():
+    return get_repository().maintained(
+        "indicadores", lambda repo: DashboardStats(repo.frame(['Role', 'Unidade', 'Data Cadastro'])),
+    )
+
+# --- BUSCA POR HABILIDADES ---
+SEARCH_FIELD_WEIGHTS = {'Nome': 2.0, 'Resumo': 1.0, 'Unidade': 0.5}
+
+def _tokens(text):
+    """Termos sem acento e em minúsculas (2+ caracteres)."""
+    return [t for t in re.findall(r"[a-z0-9]+", fold_text(text)) if len(t) >= 2]
+
+class SearchIndex:
+    """Índice invertido sobre Nome, Resumo e Unidade dos profissionais.
+
+    Mantido pelo repositório a cada escrita (`add`/`discard`). As consultas
+    aceitam vários termos, casam por prefixo (vocabulário ordenado + bisect)
+    e ordenam por termos encontrados e depois por um peso tf-idf.
+    """
+
+    COLUMNS = {'Nome', 'Resumo', 'Unidade', 'Role'}
+
+    def __init__(self, frame=None):
+        self.postings = {}   # termo -> {telefone: peso}
+        self.docs = {}       # telefone -> {termo: peso}
+        self.vocabulary = [] # termos ordenados, para busca por prefixo
+        if frame is not None:
+            for phone, nome, unidade, resumo, role in frame[['Telefone', 'Nome', 'Unidade', 'Resumo', 'Role']].itertuples(index=False):
+                self._add_doc(phone, role, {'Nome': nome, 'Unidade': unidade, 'Resumo': resumo})
+
+    def _add_doc(self, phone, role, fields):
+        if role == 'admin':
+            return
+        key = clean_phone_number(phone)
+        self._remove_doc(key)
+        weights = {}
+        for field, text in fields.items():
+            for term in _tokens(text):
+                weights[term] = weights.get(term, 0.0) + SEARCH_FIELD_WEIGHTS[field]
+        if not weights:
+            return
+        self.docs[key] = weights
+        for term, weight in weights.items():
+            if term not in self.postings:
+                self.postings[term] = {}
+                bisect.insort(self.vocabulary, term)
+            self.postings[term][key] = weight
+
+    def _remove_doc(self, key):
+        for term in self.docs.pop(key, {}):
+            posting = self.postings[term]
+            posting.pop(key, None)
+            if not posting:
+                del self.postings[term]
+                del self.vocabulary[bisect.bisect_left(self.vocabulary, term)]
+
+    # Interface usada pelo UserRepository (linhas na forma gravada)
+    def add(self, row):
+        self._add_doc(row['Telefone'], row['Role'], {
+            'Nome': row['Nome'], 'Unidade': row['Unidade'], 'Resumo': decrypt(row['Resumo']),
+        })
+
+    def discard(self, row):
+        self._remove_doc(clean_phone_number(row['Telefone']))
+
+    def _expand(self, token):
+        """Termos do vocabulário que começam com `token`."""
+        start = bisect.bisect_left(self.vocabulary, token)
+        end = bisect.bisect_left(self.vocabulary, token + "\uffff")
+        return self.vocabulary[start:end]
+
+    def search(self, query, limit=None):
+        """Telefones (normalizados) dos profissionais mais relevantes para `query`."""
+        total = max(len(self.docs), 1)
+        matched, scores = {}, {}
+        for token in dict.fromkeys(_tokens(query)):
+            best = {}
+            for term in self._expand(token):
+                posting = self.postings[term]
+                idf = math.log(1 + total / len(posting))
+                exact = 1.0 if term == token else 0.7
+                for key, weight in posting.items():
+                    score = idf * exact * weight / (weight + 1.0)
+                    if score > best.get(key, 0.0):
+                        best[key] = score
+            for key, score in best.items():
+                matched[key] = matched.get(key, 0) + 1
+                scores[key] = scores.get(key, 0.0) + score
+        ranked = sorted(scores, key=lambda key: (matched[key], scores[key]), reverse=True)
+        return ranked[:limit] if limit else ranked
+
+def get_search_index():
+    """Índice de busca do processo, montado uma vez e mantido pelas escritas."""
+    return get_repository().maintained(
+        "busca", lambda repo: SearchIndex(repo.frame(['Telefone', 'Nome', 'Unidade', 'Resumo', 'Role'])),
+    )
+
+def search_users(query, columns=None, limit=None):
+    """Profissionais que casam com `query`, do mais para o menos relevante."""
+    repo = get_repository()
+    with repo.lock:
+        keys = get_search_index().search(query, limit)
+        df = repo.frame(columns)
+        labels = [label for label in map(repo.label_of, keys) if label is not None]
+        return df.loc[labels]
+
+# --- MANIPULAÇÃO DE DATAS ---
+# Início (no ano bissexto de referência) de cada mês, para indexar por dia do ano.
+_MONTH_OFFSETS = [0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335]
+
+def _day_key(month, day):
+    """Dia do ano (1-366) de um dia/mês, contando 29/02 sempre."""
+    return _MONTH_OFFSETS[month - 1] + day
+
+class BirthdayIndex:
+    """Aniversários dos profissionais ordenados por dia do ano.
+
+    `Nascimento` é convertido uma única vez (de forma vetorizada) e as
+    consultas por período viram buscas binárias sobre a chave ordenada.
+    """
+
+    def __init__(self, frame):
+        nascimento = frame['Nascimento'].fillna("").str.strip()
+        dates = pd.to_datetime(nascimento, format="%d/%m/%Y", errors="coerce")
+        self.invalid = frame.loc[(nascimento != "") & dates.isna(), ['Nome', 'Unidade', 'Nascimento']]
+
+        valid = dates.notna()
+        months = dates[valid].dt.month.to_numpy()
+        days = dates[valid].dt.day.to_numpy()
+        keys = np.take(_MONTH_OFFSETS, months - 1) + days
+
+        rows = frame.loc[valid, ['Nome', 'Unidade', 'Nascimento']].assign(_chave=keys)
+        self.rows = rows.sort_values('_chave', kind='stable')
+        self.keys = self.rows['_chave'].to_numpy()
+
+    def _slice(self, first, last):
+        start = np.searchsorted(self.keys, first, side='left')
+        end = np.searchsorted(self.keys, last, side='right')
+        return self.rows.iloc[start:end]
+
+    def between(self, start, end):
+        """Aniversariantes entre duas datas (inclusive), na ordem em que ocorrem."""
+        if (end - start).days >= 365:
+            result = self.rows
+        else:
+            first, last = _day_key(start.month, start.day), _day_key(end.month, end.day)
+            if (end.month, end.day) == (2, 28) and not calendar.isleap(end.year):
+                last = _day_key(2, 29)  # fora de ano bissexto, 29/02 entra junto com o dia 28
+            if first <= last:
+                result = self._slice(first, last)
+            else:  # atravessa a virada do ano
+                result = pd.concat([self._slice(first, 366), self._slice(1, last)])
+        return result.drop(columns='_chave')
+
+    def this_month(self, today=None):
+        today = today or date.today()
+        first = today.replace(day=1)
+        last = (first + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        return self.between(first, last)
+
+    def this_week(self, today=None):
+        today = today or date.today()
+        monday = today - timedelta(days=today.weekday())
+        return self.between(monday, monday + timedelta(days=6))
+
+    def next_days(self, n, today=None):
+        today = today or date.today()
+        return self.between(today, today + timedelta(days=max(n, 1) - 1))
+
+def get_birthday_index():
+    """Índice de aniversários dos profissionais, refeito só quando os dados mudam."""
+    return get_repository().derived(
+        "aniversarios",
+        lambda repo: BirthdayIndex(find_users(['Nome', 'Unidade', 'Nascimento'], exclude_role='admin')),
+    )
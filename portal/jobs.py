@@ -0,0 +1,130 @@
+"""Tarefas em segundo plano com progresso persistente."""
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import streamlit as st
+
+from .storage import get_state_db
+
+# --- TAREFAS EM SEGUNDO PLANO ---
+# Operações demoradas do painel (excluir conta, importar planilha) rodam num
+# pool de threads; a tabela `tarefas` guarda estado, progresso e resultado
+# para que a tela apenas acompanhe. Tarefas que gravam no cadastro rodam uma
+# de cada vez (`write_lock`).
+
+JOB_PROGRESS_INTERVAL = 0.25  # s entre gravações de progresso de uma tarefa
+JOB_POLL_SECONDS = 1
+
+class JobRunner:
+    """Executor de tarefas com registro persistente (SQLite, modo WAL)."""
+
+    def __init__(self, db, max_workers=2):
+        self.db = db
+        db.register("tarefas", self._create_schema)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="corpore-tarefa")
+        self.write_lock = threading.Lock()
+        self._interrupt_stale()
+
+    @staticmethod
+    def _create_schema(conn):
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS tarefas ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT, tipo TEXT NOT NULL, descricao TEXT NOT NULL,"
+            " status TEXT NOT NULL, progresso REAL NOT NULL DEFAULT 0, mensagem TEXT NOT NULL DEFAULT '',"
+            " resultado TEXT NOT NULL DEFAULT '', erro TEXT NOT NULL DEFAULT '',"
+            " autor TEXT NOT NULL DEFAULT '', criado_em TEXT NOT NULL, concluido_em TEXT NOT NULL DEFAULT '')"
+        )
+
+    def _update(self, job_id, **fields):
+        sets = ", ".join(f"{col} = ?" for col in fields)
+        conn = self.db.connect()
+        try:
+            with conn:
+                conn.execute(f"UPDATE tarefas SET {sets} WHERE id = ?", [*fields.values(), job_id])
+        finally:
+            conn.close()
+
+    def _interrupt_stale(self):
+        """Tarefas que ficaram abertas num processo anterior não vão mais terminar."""
+        conn = self.db.connect()
+        try:
+            with conn:
+                conn.execute(
+                    "UPDATE tarefas SET status = 'erro', erro = 'Interrompida (o servidor reiniciou).' "
+                    "WHERE status IN ('pendente', 'executando')"
+                )
+        finally:
+            conn.close()
+
+    def submit(self, kind, description, fn, *args, author="", writes=False, **kwargs):
+        """Agenda `fn(*args, progress=..., **kwargs)` e retorna o id da tarefa na hora.
+
+        `progress(fração, mensagem)` pode ser chamado à vontade: as gravações
+        são espaçadas. O retorno de `fn` (JSON) fica em `resultado`.
+        """
+        conn = self.db.connect()
+        try:
+            with conn:
+                job_id = conn.execute(
+                    "INSERT INTO tarefas (tipo, descricao, status, autor, criado_em) VALUES (?, ?, 'pendente', ?, ?)",
+                    (kind, description, author, datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+                ).lastrowid
+        finally:
+            conn.close()
+        self.executor.submit(self._run, job_id, fn, args, kwargs, writes)
+        return job_id
+
+    def _run(self, job_id, fn, args, kwargs, writes):
+        last = [0.0]
+
+        def progress(fraction, message=""):
+            now = time.monotonic()
+            if now - last[0] >= JOB_PROGRESS_INTERVAL:
+                last[0] = now
+                self._update(job_id, progresso=min(max(fraction, 0.0), 1.0), mensagem=message)
+
+        self._update(job_id, status="executando")
+        try:
+            if writes:
+                with self.write_lock:
+                    result = fn(*args, progress=progress, **kwargs)
+            else:
+                result = fn(*args, progress=progress, **kwargs)
+            self._update(job_id, status="concluida", progresso=1.0, mensagem="", resultado=json.dumps(result, default=str))
+        except Exception as e:
+            self._update(job_id, status="erro", erro=str(e) or type(e).__name__)
+        finally:
+            self._update(job_id, concluido_em=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+
+    def get(self, job_id):
+        conn = self.db.connect()
+        try:
+            row = conn.execute("SELECT * FROM tarefas WHERE id = ?", (job_id,)).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        job = dict(row)
+        job["resultado"] = json.loads(job["resultado"]) if job["resultado"] else None
+        return job
+
+    def recent(self, limit=20):
+        conn = self.db.connect()
+        try:
+            return [dict(row) for row in conn.execute("SELECT * FROM tarefas ORDER BY id DESC LIMIT ?", (limit,))]
+        finally:
+            conn.close()
+
+@st.cache_resource
+def get_jobs():
+    """Executor de tarefas do processo (registro no banco de estado)."""
+    return JobRunner(get_state_db())
+
+def start_job(kind, description, fn, *args, **kwargs):
+    """Agenda uma tarefa e passa a acompanhá-la no painel desta sessão."""
+    job_id = get_jobs().submit(kind, description, fn, *args, **kwargs)
+    st.session_state.setdefault("_jobs", []).append(job_id)
+    return job_id
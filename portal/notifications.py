@@ -0,0 +1,161 @@
+"""Avisos da gestão: log só de inclusão com cursores de leitura por usuário."""
+from datetime import datetime
+
+import streamlit as st
+
+from .storage import get_state_db
+from .users import find_users, get_repository, update_users, user_exists
+from .util import clean_phone_number
+
+# --- NOTIFICAÇÕES ---
+# Log de avisos só de inclusão, fora da tabela de usuários: enviar ou marcar
+# como lido nunca regrava perfis. Um aviso mira todos, uma unidade ou um
+# usuário, e cada usuário tem um cursor com o último id que já leu.
+
+class NotificationStore:
+    """Avisos da gestão e cursores de leitura (SQLite, modo WAL)."""
+
+    def __init__(self, db):
+        self.db = db
+        db.register("notificacoes", self._create_schema)
+
+    @staticmethod
+    def _create_schema(conn):
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS notificacoes ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT, criado_em TEXT NOT NULL,"
+            " alvo TEXT NOT NULL, destino TEXT NOT NULL DEFAULT '',"
+            " mensagem TEXT NOT NULL, autor TEXT NOT NULL DEFAULT '')"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_notificacoes_alvo ON notificacoes (alvo, destino, id)")
+        conn.execute("CREATE TABLE IF NOT EXISTS leituras (telefone TEXT PRIMARY KEY, ultima_lida INTEGER NOT NULL)")
+
+    def send(self, message, target="todos", dest="", author=""):
+        """Registra um aviso para `todos`, uma `unidade` ou um `usuario`. Retorna o id."""
+        if target == "usuario":
+            dest = clean_phone_number(dest)
+        conn = self.db.connect()
+        try:
+            with conn:
+                cur = conn.execute(
+                    "INSERT INTO notificacoes (criado_em, alvo, destino, mensagem, autor) VALUES (?, ?, ?, ?, ?)",
+                    (datetime.now().strftime("%Y-%m-%d %H:%M"), target, dest, message, author),
+                )
+                return cur.lastrowid
+        finally:
+            conn.close()
+
+    def latest_id(self):
+        conn = self.db.connect()
+        try:
+            return conn.execute("SELECT COALESCE(MAX(id), 0) FROM notificacoes").fetchone()[0]
+        finally:
+            conn.close()
+
+    def read_cursor(self, phone):
+        conn = self.db.connect()
+        try:
+            row = conn.execute("SELECT ultima_lida FROM leituras WHERE telefone = ?", (clean_phone_number(phone),)).fetchone()
+            return row[0] if row else 0
+        finally:
+            conn.close()
+
+    def for_user(self, phone, unit, after_id=0, limit=None):
+        """Avisos visíveis para o usuário com id > `after_id`, do mais novo ao mais antigo."""
+        sql = (
+            "SELECT * FROM notificacoes WHERE id > ? AND ("
+            " alvo = 'todos' OR (alvo = 'unidade' AND destino = ?) OR (alvo = 'usuario' AND destino = ?)"
+            ") ORDER BY id DESC"
+        )
+        params = [after_id, unit or "", clean_phone_number(phone)]
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        conn = self.db.connect()
+        try:
+            return [dict(row) for row in conn.execute(sql, params)]
+        finally:
+            conn.close()
+
+    def unread(self, phone, unit):
+        return self.for_user(phone, unit, after_id=self.read_cursor(phone))
+
+    def mark_read(self, phone, up_to_id):
+        """Avança o cursor de leitura (nunca retrocede)."""
+        conn = self.db.connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT INTO leituras (telefone, ultima_lida) VALUES (?, ?) "
+                    "ON CONFLICT(telefone) DO UPDATE SET ultima_lida = MAX(ultima_lida, excluded.ultima_lida)",
+                    (clean_phone_number(phone), up_to_id),
+                )
+        finally:
+            conn.close()
+
+    def mark_read_many(self, phones, up_to_id):
+        conn = self.db.connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO leituras (telefone, ultima_lida) VALUES (?, ?) "
+                    "ON CONFLICT(telefone) DO UPDATE SET ultima_lida = MAX(ultima_lida, excluded.ultima_lida)",
+                    [(clean_phone_number(phone), up_to_id) for phone in phones],
+                )
+        finally:
+            conn.close()
+
+    def recent(self, limit=20):
+        conn = self.db.connect()
+        try:
+            return [dict(row) for row in conn.execute("SELECT * FROM notificacoes ORDER BY id DESC LIMIT ?", (limit,))]
+        finally:
+            conn.close()
+
+    def rename_user(self, old_phone, new_phone):
+        old_id, new_id = clean_phone_number(old_phone), clean_phone_number(new_phone)
+        if old_id == new_id:
+            return
+        conn = self.db.connect()
+        try:
+            with conn:
+                conn.execute("UPDATE notificacoes SET destino = ? WHERE alvo = 'usuario' AND destino = ?", (new_id, old_id))
+                conn.execute("UPDATE OR REPLACE leituras SET telefone = ? WHERE telefone = ?", (new_id, old_id))
+        finally:
+            conn.close()
+
+def migrate_legacy_notifications(store):
+    """Move avisos pendentes da antiga coluna `Notificacao` para o log (uma vez)."""
+    pending = find_users(['Telefone', 'Notificacao'])
+    pending = pending[pending['Notificacao'] != ""]
+    for phone, message in pending.itertuples(index=False):
+        store.send(message, "usuario", phone)
+    if not pending.empty:
+        update_users(pending['Telefone'].tolist(), {'Notificacao': ""})
+    return len(pending)
+
+@st.cache_resource
+def get_notifications():
+    """Log de avisos do processo."""
+    store = NotificationStore(get_state_db())
+    migrate_legacy_notifications(store)
+    return store
+
+def send_notification_to_all(message, author=""):
+    get_notifications().send(message, "todos", author=author)
+    return len(get_repository().labels(exclude_role='admin'))
+
+def send_notification_to_unit(unit, message, author=""):
+    get_notifications().send(message, "unidade", unit, author=author)
+    return len(get_repository().labels(unit=unit, exclude_role='admin'))
+
+def send_notification_individual(phone, message, author=""):
+    if not user_exists(phone):
+        return False
+    get_notifications().send(message, "usuario", phone, author=author)
+    return True
+
+def clear_notification(user_data, up_to_id=None):
+    """Marca como lidos os avisos do usuário (até `up_to_id`, ou todos)."""
+    store = get_notifications()
+    store.mark_read(user_data['Telefone'], up_to_id if up_to_id is not None else store.latest_id())
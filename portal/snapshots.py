@@ -0,0 +1,246 @@
+"""Snapshots (backups) incrementais do cadastro, dos avisos, dos eventos e dos documentos."""
+import os
+import json
+import shutil
+import sqlite3
+import threading
+from datetime import datetime
+
+import streamlit as st
+
+from .config import (
+    BASE_FILES_DIR, FILE_DB, FILE_SQLITE_DB, FILE_STATE_DB, SNAPSHOTS_DIR,
+    SNAPSHOT_KEEP, STORAGE_BACKEND
+)
+from .files import manifest_cache
+from .events import get_events
+from .notifications import get_notifications
+from .storage import sqlite_connect, get_state_db, get_storage
+from .users import get_repository
+
+# --- SNAPSHOTS ---
+# Cada snapshot é uma pasta em SNAPSHOTS_DIR com cópias consistentes dos
+# bancos (API de backup do SQLite, sem travar leitores nem escritores) e da
+# árvore de documentos. Arquivos iguais (tamanho + mtime) aos do snapshot
+# anterior viram hardlinks para ele: cada snapshot só ocupa o que mudou.
+# O snapshot é montado numa pasta oculta e só aparece, já completo, no rename final.
+SNAPSHOT_META = "snapshot.json"
+
+@st.cache_resource
+def get_snapshot_lock():
+    """Um snapshot ou restauração por vez no processo."""
+    return threading.Lock()
+
+def _backup_sqlite(src_path, dst_path):
+    src = sqlite_connect(src_path)
+    dst = sqlite3.connect(dst_path)
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+
+def list_snapshots():
+    """Metadados dos snapshots completos, do mais novo ao mais antigo."""
+    if not os.path.isdir(SNAPSHOTS_DIR):
+        return []
+    snapshots = []
+    for name in sorted(os.listdir(SNAPSHOTS_DIR), reverse=True):
+        meta_path = os.path.join(SNAPSHOTS_DIR, name, SNAPSHOT_META)
+        if not name.startswith(".") and os.path.isfile(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                snapshots.append(json.load(f))
+    return snapshots
+
+def _copy_tree(src_root, dst_root, previous_root=None, progress=None):
+    """Copia `src_root` para `dst_root` reaproveitando arquivos de `previous_root`.
+
+    Hardlinks dentro da origem (blob e caixas de entrada) continuam sendo um
+    único arquivo na cópia. Arquivos apagados durante a cópia são ignorados.
+    """
+    stats = {"arquivos": 0, "reaproveitados": 0, "copiados": 0, "bytes_copiados": 0}
+    copied = {}  # (dispositivo, inode) na origem -> caminho já criado no destino
+    walk = list(os.walk(src_root))
+    total = max(sum(len(files) for _, _, files in walk), 1)
+    for root, _, files in walk:
+        rel = os.path.relpath(root, src_root)
+        target_dir = os.path.normpath(os.path.join(dst_root, rel))
+        os.makedirs(target_dir, exist_ok=True)
+        for name in files:
+            src, dst = os.path.join(root, name), os.path.join(target_dir, name)
+            try:
+                src_stat = os.stat(src, follow_symlinks=False)
+            except FileNotFoundError:
+                continue
+            inode = (src_stat.st_dev, src_stat.st_ino)
+            if inode in copied:
+                os.link(copied[inode], dst)
+            else:
+                prev = os.path.normpath(os.path.join(previous_root, rel, name)) if previous_root else None
+                try:
+                    prev_stat = os.stat(prev) if prev else None
+                except FileNotFoundError:
+                    prev_stat = None
+                if prev_stat and (prev_stat.st_size, prev_stat.st_mtime_ns) == (src_stat.st_size, src_stat.st_mtime_ns):
+                    os.link(prev, dst)
+                    stats["reaproveitados"] += 1
+                else:
+                    try:
+                        shutil.copy2(src, dst)
+                    except FileNotFoundError:
+                        continue
+                    stats["copiados"] += 1
+                    stats["bytes_copiados"] += src_stat.st_size
+                copied[inode] = dst
+            stats["arquivos"] += 1
+            if progress:
+                progress(stats["arquivos"] / total, f"{stats['arquivos']} de {total} arquivo(s)")
+    return stats
+
+def _create_snapshot(reason, progress=None, protect=()):
+    base = name = datetime.now().strftime("%Y%m%d-%H%M%S")
+    suffix = 2
+    while os.path.exists(os.path.join(SNAPSHOTS_DIR, name)):
+        name, suffix = f"{base}-{suffix}", suffix + 1
+    tmp = os.path.join(SNAPSHOTS_DIR, f".{name}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    try:
+        if STORAGE_BACKEND == "csv":
+            if os.path.exists(FILE_DB):
+                with get_repository().lock:  # as escritas do CSV não são atômicas
+                    shutil.copy2(FILE_DB, os.path.join(tmp, "usuarios.csv"))
+        elif os.path.exists(FILE_SQLITE_DB):
+            _backup_sqlite(FILE_SQLITE_DB, os.path.join(tmp, "usuarios.sqlite3"))
+        if os.path.exists(FILE_STATE_DB):
+            _backup_sqlite(FILE_STATE_DB, os.path.join(tmp, "estado.sqlite3"))
+
+        previous = list_snapshots()
+        previous_docs = os.path.join(SNAPSHOTS_DIR, previous[0]["nome"], "docs") if previous else None
+        stats = {}
+        if os.path.isdir(BASE_FILES_DIR):
+            stats = _copy_tree(BASE_FILES_DIR, os.path.join(tmp, "docs"), previous_docs, progress)
+        meta = {"nome": name, "criado_em": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "motivo": reason, "armazenamento": STORAGE_BACKEND, **stats}
+        with open(os.path.join(tmp, SNAPSHOT_META), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.rename(tmp, os.path.join(SNAPSHOTS_DIR, name))
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    prune_snapshots(protect=protect)
+    return meta
+
+def create_snapshot(reason="manual", progress=None):
+    """Tira um snapshot do cadastro, dos avisos e dos documentos. Retorna os metadados."""
+    with get_snapshot_lock():
+        return _create_snapshot(reason, progress)
+
+def prune_snapshots(keep=SNAPSHOT_KEEP, protect=()):
+    """Mantém só os `keep` snapshots mais novos (e os de `protect`). Retorna os nomes removidos."""
+    removed = [meta["nome"] for meta in list_snapshots()[keep:] if meta["nome"] not in protect]
+    for name in removed:
+        shutil.rmtree(os.path.join(SNAPSHOTS_DIR, name), ignore_errors=True)
+    return removed
+
+def _restore_state(snapshot_db):
+    """Avisos, cursores de leitura e eventos voltam ao snapshot; a tabela de tarefas fica.
+
+    Tabelas que ainda não existiam quando o snapshot foi tirado ficam como estão.
+    """
+    get_notifications()  # registra os esquemas de avisos e eventos
+    get_events()
+    get_state_db().connect().close()
+    conn = sqlite_connect(FILE_STATE_DB)
+    try:
+        conn.execute("ATTACH DATABASE ? AS snap", (snapshot_db,))
+        saved = {row[0] for row in conn.execute("SELECT name FROM snap.sqlite_master WHERE type = 'table'")}
+        with conn:
+            for table in ("notificacoes", "leituras", "eventos"):
+                if table not in saved:
+                    continue
+                conn.execute(f"DELETE FROM main.{table}")
+                conn.execute(f"INSERT INTO main.{table} SELECT * FROM snap.{table}")
+        conn.execute("DETACH DATABASE snap")
+    finally:
+        conn.close()
+
+def _check_snapshot(path):
+    """Confere que o snapshot está completo e legível antes de mexer em qualquer coisa."""
+    try:
+        with open(os.path.join(path, SNAPSHOT_META), encoding="utf-8") as f:
+            meta = json.load(f)
+    except (FileNotFoundError, ValueError):
+        raise ValueError(f"Snapshot '{os.path.basename(path)}' não encontrado ou incompleto.") from None
+    if meta["armazenamento"] != STORAGE_BACKEND:
+        raise ValueError(f"Snapshot gravado com o armazenamento '{meta['armazenamento']}'.")
+    users_file = "usuarios.csv" if STORAGE_BACKEND == "csv" else "usuarios.sqlite3"
+    if not os.path.isfile(os.path.join(path, users_file)):
+        raise ValueError("Snapshot sem o cadastro de usuários.")
+    for db in ("usuarios.sqlite3", "estado.sqlite3"):
+        db_path = os.path.join(path, db)
+        if not os.path.isfile(db_path):
+            continue
+        conn = sqlite_connect(db_path)
+        try:
+            ok = conn.execute("PRAGMA quick_check").fetchone()[0] == "ok"
+        except sqlite3.DatabaseError:
+            ok = False
+        finally:
+            conn.close()
+        if not ok:
+            raise ValueError(f"Arquivo {db} do snapshot está corrompido.")
+    return meta
+
+def restore_snapshot(name, progress=None):
+    """Volta cadastro, avisos, eventos e documentos ao snapshot `name`.
+
+    Antes, tira um snapshot do estado atual (a restauração pode ser desfeita).
+    A geração do banco avança, então todos os caches são relidos.
+    """
+    progress = progress or (lambda fraction, message="": None)
+    path = os.path.join(SNAPSHOTS_DIR, name)
+
+    with get_snapshot_lock():
+        meta = _check_snapshot(path)
+        progress(0.0, "Salvando o estado atual")
+        # A retenção não pode levar embora justamente o snapshot que será restaurado
+        _create_snapshot(f"antes de restaurar {name}", protect=(name,))
+
+        progress(0.3, "Restaurando o cadastro")
+        repo = get_repository()
+        with repo.lock:
+            if STORAGE_BACKEND == "csv":
+                shutil.copy2(os.path.join(path, "usuarios.csv"), FILE_DB + ".restaurando")
+                os.replace(FILE_DB + ".restaurando", FILE_DB)
+            else:
+                storage = get_storage()
+                before = storage.version()
+                _backup_sqlite(os.path.join(path, "usuarios.sqlite3"), FILE_SQLITE_DB)
+                conn = sqlite_connect(FILE_SQLITE_DB)
+                try:
+                    with conn:
+                        conn.execute("UPDATE meta SET valor = MAX(valor, ?) + 1 WHERE chave = 'geracao'", (before,))
+                finally:
+                    conn.close()
+            repo.raw = None
+        if os.path.exists(os.path.join(path, "estado.sqlite3")):
+            _restore_state(os.path.join(path, "estado.sqlite3"))
+
+        progress(0.4, "Restaurando documentos")
+        staging = BASE_FILES_DIR + ".restaurando"
+        shutil.rmtree(staging, ignore_errors=True)
+        if os.path.isdir(os.path.join(path, "docs")):
+            _copy_tree(os.path.join(path, "docs"), staging,
+                       progress=lambda fraction, message="": progress(0.4 + 0.6 * fraction, message))
+        else:
+            os.makedirs(staging)
+        old = f"{BASE_FILES_DIR}.antigo-{datetime.now():%Y%m%d%H%M%S}"
+        if os.path.exists(BASE_FILES_DIR):
+            os.rename(BASE_FILES_DIR, old)
+        os.rename(staging, BASE_FILES_DIR)
+        shutil.rmtree(old, ignore_errors=True)
+        cache = manifest_cache()
+        with cache["lock"]:
+            cache["dirs"].clear()
+    return meta
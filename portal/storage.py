@@ -0,0 +1,288 @@
+"""Backends de armazenamento da tabela de usuários (CSV legado e SQLite)."""
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+import streamlit as st
+
+from .config import ALL_COLUMNS, FILE_DB, FILE_SQLITE_DB, FILE_STATE_DB, STORAGE_BACKEND
+from .diagnostics import count_event
+
+# --- ARMAZENAMENTO ---
+# Os backends guardam e devolvem os registros já criptografados (forma "at rest").
+
+def _empty_frame():
+    return pd.DataFrame(columns=ALL_COLUMNS)
+
+def sqlite_connect(path):
+    """Conexão curta (uma por operação): sqlite3 não compartilha conexões entre threads."""
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA busy_timeout = 30000")
+    return conn
+
+class CsvStorage:
+    """Backend legado: um único CSV reescrito a cada alteração."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def version(self):
+        """Assinatura barata do arquivo (mtime, tamanho) para invalidar caches."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def read(self):
+        if not os.path.exists(self.path):
+            return _empty_frame()
+        df = pd.read_csv(self.path, dtype=str, keep_default_na=False)
+        count_event("csv_leituras")
+        count_event("bytes_lidos", os.path.getsize(self.path))
+
+        # Garante colunas novas e remove antigas se existirem
+        for col in ALL_COLUMNS:
+            if col not in df.columns:
+                df[col] = ""
+        return df[ALL_COLUMNS]
+
+    # As escritas devolvem (versão antes, versão depois) para o cache em memória.
+    def _write(self, df, before):
+        df.to_csv(self.path, index=False)
+        count_event("csv_gravacoes")
+        return before, self.version()
+
+    def upsert(self, row, old_key=None):
+        before = self.version()
+        df = self.read()
+        target = old_key if old_key else row['Telefone']
+        df = df[(df['Telefone'] != target) & (df['Telefone'] != row['Telefone'])]
+        new_row = pd.DataFrame([{col: row.get(col, "") for col in ALL_COLUMNS}])
+        return self._write(pd.concat([df, new_row], ignore_index=True), before)
+
+    def delete(self, phone):
+        before = self.version()
+        df = self.read()
+        return self._write(df[df['Telefone'] != phone], before)
+
+    def update_many(self, phones, changes):
+        before = self.version()
+        df = self.read()
+        mask = df['Telefone'].isin(phones)
+        for col, value in changes.items():
+            df.loc[mask, col] = value
+        return self._write(df, before)
+
+    def import_frame(self, df):
+        before = self.version()
+        current = self.read()
+        new_rows = df.reindex(columns=ALL_COLUMNS).fillna("")
+        new_rows = new_rows[~new_rows['Telefone'].isin(current['Telefone'])]  # nunca sobrescreve
+        return self._write(pd.concat([current, new_rows], ignore_index=True), before)
+
+    def destroy(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+class SqliteStorage:
+    """Backend SQLite em modo WAL: `Telefone` é a chave primária e cada
+    escrita altera só as linhas envolvidas."""
+
+    TABLE = "usuarios"
+
+    def __init__(self, path):
+        self.path = path
+        self._schema_ready = False
+
+    def _connect(self):
+        if not os.path.exists(self.path):
+            self._schema_ready = False
+        conn = sqlite_connect(self.path)
+        if not self._schema_ready:
+            self._create_schema(conn)
+            self._schema_ready = True
+        return conn
+
+    def _create_schema(self, conn):
+        conn.execute("PRAGMA journal_mode = WAL")
+        cols = ", ".join(
+            '"Telefone" TEXT PRIMARY KEY' if col == 'Telefone' else f'"{col}" TEXT NOT NULL DEFAULT \'\''
+            for col in ALL_COLUMNS
+        )
+        with conn:
+            conn.execute(f'CREATE TABLE IF NOT EXISTS {self.TABLE} ({cols})')
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (chave TEXT PRIMARY KEY, valor INTEGER NOT NULL)")
+            conn.execute("INSERT OR IGNORE INTO meta (chave, valor) VALUES ('geracao', 0)")
+
+    def _bump(self, conn):
+        """Avança a geração dentro da transação de escrita e devolve (antes, depois)."""
+        before = conn.execute("SELECT valor FROM meta WHERE chave = 'geracao'").fetchone()[0]
+        conn.execute("UPDATE meta SET valor = ? WHERE chave = 'geracao'", (before + 1,))
+        count_event("sqlite_gravacoes")
+        return before, before + 1
+
+    def version(self):
+        """Contador de gerações gravado junto com cada escrita (vale entre processos)."""
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT valor FROM meta WHERE chave = 'geracao'").fetchone()[0]
+        finally:
+            conn.close()
+
+    def read(self):
+        conn = self._connect()
+        try:
+            cols = ", ".join(f'"{c}"' for c in ALL_COLUMNS)
+            df = pd.read_sql_query(f"SELECT {cols} FROM {self.TABLE} ORDER BY rowid", conn, dtype=str)
+        finally:
+            conn.close()
+        count_event("sqlite_leituras")
+        return df.fillna("")
+
+    def upsert(self, row, old_key=None):
+        cols = ", ".join(f'"{c}"' for c in ALL_COLUMNS)
+        marks = ", ".join("?" for _ in ALL_COLUMNS)
+        updates = ", ".join(f'"{c}" = excluded."{c}"' for c in ALL_COLUMNS if c != 'Telefone')
+        values = [row.get(col, "") or "" for col in ALL_COLUMNS]
+        conn = self._connect()
+        try:
+            with conn:
+                if old_key and old_key != row['Telefone']:
+                    conn.execute(f'DELETE FROM {self.TABLE} WHERE "Telefone" = ?', (old_key,))
+                conn.execute(
+                    f'INSERT INTO {self.TABLE} ({cols}) VALUES ({marks}) '
+                    f'ON CONFLICT("Telefone") DO UPDATE SET {updates}',
+                    values,
+                )
+                return self._bump(conn)
+        finally:
+            conn.close()
+
+    def delete(self, phone):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(f'DELETE FROM {self.TABLE} WHERE "Telefone" = ?', (phone,))
+                return self._bump(conn)
+        finally:
+            conn.close()
+
+    def update_many(self, phones, changes):
+        sets = ", ".join(f'"{c}" = ?' for c in changes)
+        values = list(changes.values())
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    f'UPDATE {self.TABLE} SET {sets} WHERE "Telefone" = ?',
+                    [values + [phone] for phone in phones],
+                )
+                return self._bump(conn)
+        finally:
+            conn.close()
+
+    def is_empty(self):
+        conn = self._connect()
+        try:
+            return conn.execute(f"SELECT 1 FROM {self.TABLE} LIMIT 1").fetchone() is None
+        finally:
+            conn.close()
+
+    def import_frame(self, df):
+        """Insere registros já criptografados numa única transação.
+
+        Telefones que já existem no banco são ignorados, nunca sobrescritos.
+        """
+        cols = ", ".join(f'"{c}"' for c in ALL_COLUMNS)
+        marks = ", ".join("?" for _ in ALL_COLUMNS)
+        rows = df.reindex(columns=ALL_COLUMNS).fillna("").itertuples(index=False, name=None)
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(f"INSERT OR IGNORE INTO {self.TABLE} ({cols}) VALUES ({marks})", rows)
+                return self._bump(conn)
+        finally:
+            conn.close()
+
+    def destroy(self):
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+        self._schema_ready = False
+
+def migrate_csv_to_sqlite(csv_path, sqlite_path):
+    """Migração única do CSV legado para o SQLite.
+
+    Os campos sensíveis são copiados já criptografados, sem decodificar.
+    O CSV é renomeado para `.migrado` para não ser importado de novo.
+    Retorna a quantidade de registros migrados.
+    """
+    if not os.path.exists(csv_path):
+        return 0
+    target = SqliteStorage(sqlite_path)
+    if not target.is_empty():
+        return 0
+    df = CsvStorage(csv_path).read()
+    df = df[df['Telefone'] != ""]
+    target.import_frame(df)
+    os.replace(csv_path, csv_path + ".migrado")
+    return len(df)
+
+@st.cache_resource
+def get_storage():
+    """Backend de armazenamento do processo (escolhido por CORPORE_STORAGE)."""
+    if STORAGE_BACKEND == "csv":
+        return CsvStorage(FILE_DB)
+    migrate_csv_to_sqlite(FILE_DB, FILE_SQLITE_DB)
+    return SqliteStorage(FILE_SQLITE_DB)
+
+# --- BANCO DE ESTADO ---
+# Avisos, tarefas e eventos dividem FILE_STATE_DB. Cada store registra aqui
+# como criar as próprias tabelas, e o esquema é garantido por inteiro: se o
+# arquivo some (RESET), a próxima conexão de qualquer store recria as
+# tabelas de todos.
+
+class StateDatabase:
+    """Banco SQLite (modo WAL) compartilhado pelos stores da aplicação."""
+
+    def __init__(self, path):
+        self.path = path
+        self.schemas = {}
+        self.lock = threading.Lock()
+        self._schema_ready = False
+
+    def register(self, name, create):
+        """Registra `create(conn)`, que cria as tabelas de um store (IF NOT EXISTS)."""
+        with self.lock:
+            self.schemas[name] = create
+            self._schema_ready = False
+
+    def connect(self):
+        """Conexão curta, com linhas sqlite3.Row e todas as tabelas registradas."""
+        if not os.path.exists(self.path):
+            self._schema_ready = False
+        conn = sqlite_connect(self.path)
+        conn.row_factory = sqlite3.Row
+        if not self._schema_ready:
+            with self.lock:
+                conn.execute("PRAGMA journal_mode = WAL")
+                with conn:
+                    for create in self.schemas.values():
+                        create(conn)
+                self._schema_ready = True
+        return conn
+
+    def destroy(self):
+        """Apaga o arquivo (e WAL); as tabelas voltam vazias na próxima conexão."""
+        with self.lock:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(self.path + suffix):
+                    os.remove(self.path + suffix)
+            self._schema_ready = False
+
+@st.cache_resource
+def get_state_db():
+    """Banco de estado do processo (avisos, tarefas, eventos)."""
+    return StateDatabase(FILE_STATE_DB)
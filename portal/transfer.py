@@ -0,0 +1,184 @@
+"""Importação e exportação de profissionais em planilhas (XLSX/CSV)."""
+import io
+import csv
+import tempfile
+from datetime import datetime
+
+import pandas as pd
+
+from .config import ALL_COLUMNS, SENSITIVE_COLUMNS, UNIDADES_OPCOES
+from .diagnostics import instrumented
+from .files import ensure_user_dirs
+from .notifications import get_notifications
+from .users import map_unique, prepare_password, decode_column, encode_column, get_repository
+from .util import clean_phone_number, fold_text
+
+# --- IMPORTAÇÃO / EXPORTAÇÃO ---
+# Planilhas são lidas linha a linha (openpyxl em modo read-only ou csv) e
+# gravadas de uma vez; a exportação escreve em blocos num arquivo temporário.
+
+# Cabeçalhos aceitos na importação (sem acento/maiúsculas) -> coluna do banco
+IMPORT_HEADERS = {
+    "nome": "Nome", "telefone": "Telefone", "celular": "Telefone", "senha": "Senha",
+    "unidade": "Unidade", "email": "Email", "e-mail": "Email", "pix": "Pix", "banco": "Banco",
+    "nascimento": "Nascimento", "data nascimento": "Nascimento", "resumo": "Resumo",
+}
+EXPORT_COLUMNS = ['Nome', 'Telefone', 'Unidade', 'Data Cadastro']
+EXPORT_SENSITIVE_COLUMNS = ['Email', 'Pix', 'Banco', 'Nascimento', 'Resumo']
+EXPORT_CHUNK_ROWS = 1000
+
+def iter_sheet_rows(uploaded_file):
+    """Gera (número da linha, {coluna: valor}) de um XLSX ou CSV, sem carregar tudo."""
+    if uploaded_file.name.lower().endswith(".xlsx"):
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(uploaded_file, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [IMPORT_HEADERS.get(fold_text(h or "")) for h in next(rows, [])]
+            for number, values in enumerate(rows, start=2):
+                yield number, {col: v for col, v in zip(header, values) if col}
+        finally:
+            workbook.close()
+    else:
+        text = io.TextIOWrapper(uploaded_file, encoding="utf-8-sig", newline="")
+        sample = text.read(4096)
+        text.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.reader(text, dialect)
+        header = [IMPORT_HEADERS.get(fold_text(h)) for h in next(reader, [])]
+        for number, values in enumerate(reader, start=2):
+            yield number, {col: v for col, v in zip(header, values) if col}
+        text.detach()
+
+def _cell_text(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.strftime("%d/%m/%Y")
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+@instrumented
+def import_users(uploaded_file, all_or_nothing=False, progress=None):
+    """Importa profissionais de uma planilha com uma única gravação.
+
+    Telefones são normalizados; linhas inválidas ou repetidas (no arquivo ou
+    no banco) são reportadas. Com `all_or_nothing`, qualquer erro cancela a
+    importação. Retorna {"importados": n, "erros": [(linha, mensagem)]}.
+    """
+    repo = get_repository()
+    progress = progress or (lambda fraction, message="": None)
+    today = datetime.now().strftime("%Y-%m-%d")
+    valid, errors, seen = [], [], set()
+    for number, row in iter_sheet_rows(uploaded_file):
+        if number % 500 == 0:
+            progress(0.0, f"{number} linhas lidas")
+        record = {col: _cell_text(row.get(col)) for col in IMPORT_HEADERS.values()}
+        if not any(record.values()):
+            continue
+        phone = clean_phone_number(record['Telefone'])
+        if not record['Nome']:
+            errors.append((number, "Nome obrigatório."))
+        elif not record['Senha']:
+            errors.append((number, "Senha obrigatória."))  # nunca gravar hash de senha vazia
+        elif not 10 <= len(phone) <= 13:
+            errors.append((number, f"Telefone inválido: '{record['Telefone']}'."))
+        elif phone in seen:
+            errors.append((number, f"Telefone {phone} repetido na planilha."))
+        elif repo.exists(phone):
+            errors.append((number, f"Telefone {phone} já cadastrado."))
+        elif record['Unidade'] not in UNIDADES_OPCOES:
+            errors.append((number, f"Unidade desconhecida: '{record['Unidade']}'."))
+        else:
+            seen.add(phone)
+            record.update({"Telefone": phone, "Role": "user", "Data Cadastro": today})
+            valid.append((number, record))
+
+    if not valid or (errors and all_or_nothing):
+        return {"importados": 0, "erros": errors}
+
+    numbers = [number for number, _ in valid]
+    frame = pd.DataFrame([record for _, record in valid]).reindex(columns=ALL_COLUMNS).fillna("")
+    invalid_dates = frame['Nascimento'].ne("") & pd.to_datetime(frame['Nascimento'], format="%d/%m/%Y", errors="coerce").isna()
+    frame.loc[invalid_dates, 'Nascimento'] = ""  # o índice de aniversários não aceita datas inválidas
+    for col in SENSITIVE_COLUMNS:
+        if col in frame.columns:
+            frame[col] = encode_column(frame[col])
+    # Um hash por senha distinta: lotes costumam repetir a senha inicial e o KDF é caro
+    distinct, hashed = frame['Senha'].nunique(), 0
+
+    def hash_one(password):
+        nonlocal hashed
+        hashed += 1
+        progress(0.1 + 0.6 * hashed / distinct, f"Criptografando senhas ({hashed}/{distinct})")
+        return prepare_password(password)
+
+    frame['Senha'] = map_unique(frame['Senha'], hash_one)
+
+    progress(0.7, f"Gravando {len(valid)} profissional(is)")
+    count, skipped = repo.insert_many(frame, atomic=all_or_nothing)
+    skipped = set(skipped)
+    errors += [(number, f"Telefone {phone} cadastrado durante a importação.")
+               for number, phone in zip(numbers, frame['Telefone']) if phone in skipped]
+    if not count:
+        return {"importados": 0, "erros": errors}
+    phones = [phone for phone in frame['Telefone'] if phone not in skipped]
+    for i, phone in enumerate(phones, start=1):
+        ensure_user_dirs(phone)
+        if i % 100 == 0:
+            progress(0.8 + 0.2 * i / len(phones), "Criando pastas")
+    store = get_notifications()
+    store.mark_read_many(phones, store.latest_id())
+    errors += [(number, "Nascimento inválido (esperado DD/MM/AAAA); importado sem a data.") for number, bad in zip(numbers, invalid_dates) if bad]
+    return {"importados": count, "erros": errors}
+
+def _export_chunks(include_sensitive):
+    """Blocos (DataFrames) da tabela de profissionais, decodificando só o bloco da vez."""
+    repo = get_repository()
+    with repo.lock:
+        raw = repo.sync()
+        labels = repo.labels(exclude_role='admin')
+        raw = raw.loc[labels]
+    columns = EXPORT_COLUMNS + (EXPORT_SENSITIVE_COLUMNS if include_sensitive else [])
+    for start in range(0, len(raw), EXPORT_CHUNK_ROWS):
+        chunk = raw.iloc[start:start + EXPORT_CHUNK_ROWS][columns].copy()
+        for col in columns:
+            if col in SENSITIVE_COLUMNS:
+                chunk[col] = decode_column(chunk[col])
+        yield chunk
+
+@instrumented
+def export_users(fmt="xlsx", include_sensitive=False):
+    """Exporta os profissionais e devolve o conteúdo do arquivo (bytes).
+
+    Senhas nunca saem; campos sensíveis só com `include_sensitive`. O XLSX
+    usa o modo write-only do openpyxl, que grava linha a linha num arquivo
+    temporário; só o resultado final vai para a memória.
+    """
+    columns = EXPORT_COLUMNS + (EXPORT_SENSITIVE_COLUMNS if include_sensitive else [])
+    with tempfile.TemporaryFile() as out:
+        if fmt == "xlsx":
+            from openpyxl import Workbook
+
+            workbook = Workbook(write_only=True)
+            sheet = workbook.create_sheet("Profissionais")
+            sheet.append(columns)
+            for chunk in _export_chunks(include_sensitive):
+                for values in chunk.itertuples(index=False, name=None):
+                    sheet.append(list(values))
+            workbook.save(out)
+        else:
+            text = io.TextIOWrapper(out, encoding="utf-8-sig", newline="")
+            writer = csv.writer(text, delimiter=";")
+            writer.writerow(columns)
+            for chunk in _export_chunks(include_sensitive):
+                writer.writerows(chunk.itertuples(index=False, name=None))
+            text.flush()
+            text.detach()
+        out.seek(0)
+        return out.read()
@@ -0,0 +1 @@
+"""Telas do portal. O painel da gestão (`ui.admin`) só é importado quando um administrador entra."""
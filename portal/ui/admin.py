@@ -0,0 +1,568 @@
+"""Painel de gestão (somente administradores)."""
+import os
+import io
+from datetime import datetime, date
+
+import pandas as pd
+import streamlit as st
+
+from ..config import (
+    FILE_SORT_OPTIONS, LIST_SORT_COLUMNS, MAX_ZIP_BYTES, PAGE_SIZE_OPTIONS, SNAPSHOT_KEEP,
+    UNIDADES_OPCOES, USER_QUOTA_BYTES
+)
+from ..diagnostics import METRICS_WINDOW, get_metrics, instrumented
+from ..events import RECURRENCE_LABELS, format_recurrence, get_events
+from ..files import (
+    archive_name, cached_preview, delete_file, ensure_user_dirs, file_caption,
+    format_size, guess_mime, lazy_file, group_archive, group_storage, list_files, rename_user_dir,
+    send_file_to_users, user_archive, user_storage
+)
+from ..indexes import SIGNUP_CHART_DAYS, get_birthday_index, get_dashboard_stats, search_users
+from ..jobs import JOB_POLL_SECONDS, get_jobs, start_job
+from ..notifications import (
+    clear_notification, get_notifications, send_notification_individual,
+    send_notification_to_all, send_notification_to_unit
+)
+from ..snapshots import create_snapshot, list_snapshots, restore_snapshot
+from ..transfer import export_users, import_users
+from ..users import delete_user, find_users, get_user, load_db, save_user, sorted_users, user_exists
+from ..util import clean_phone_number
+
+def render_professional_detail(row):
+    """Dados, edição e exclusão de um profissional (montado só quando aberto na lista)."""
+    key = clean_phone_number(row['Telefone'])
+
+    # --- VISUALIZAÇÃO DE DADOS (EMAIL, PIX, RESUMO) ---
+    st.markdown("#### 👤 Dados Cadastrais e Financeiros")
+    vd1, vd2, vd3 = st.columns(3)
+    with vd1:
+        st.caption("E-mail")
+        st.write(row.get('Email') if row.get('Email') else "🚫 Não informado")
+    with vd2:
+        st.caption("Chave PIX")
+        st.write(row.get('Pix') if row.get('Pix') else "🚫 Não informado")
+    with vd3:
+        st.caption("Banco")
+        st.write(row.get('Banco') if row.get('Banco') else "-")
+
+    st.caption("Resumo Profissional / Técnicas:")
+    if row.get('Resumo'):
+        st.info(row['Resumo'])
+    else:
+        st.warning("Resumo pendente de preenchimento pelo profissional.")
+
+    st.divider()
+
+    # Form de Edição
+    with st.form(f"edit_{key}"):
+        st.write("📝 **Editar Acesso/Unidade**")
+        col_e1, col_e2 = st.columns(2)
+        e_nome = col_e1.text_input("Nome", value=row['Nome'])
+        e_tel = col_e2.text_input("Celular (Login)", value=row['Telefone'])
+        e_unit = st.selectbox("Unidade", UNIDADES_OPCOES, index=UNIDADES_OPCOES.index(row['Unidade']) if row['Unidade'] in UNIDADES_OPCOES else 0)
+        e_pass = st.text_input("Nova Senha (deixe em branco para manter)", type="password")
+
+        c_save, c_del = st.columns([3, 1])
+        saved = c_save.form_submit_button("💾 Salvar Alterações")
+
+        if saved and clean_phone_number(e_tel) != clean_phone_number(row['Telefone']) and user_exists(e_tel):
+            st.error("Celular já cadastrado para outro profissional.")
+        elif saved:
+            user_updated = get_user(row['Telefone'])
+            user_updated['Nome'] = e_nome
+            user_updated['Telefone'] = e_tel
+            user_updated['Unidade'] = e_unit
+            if e_pass:
+                user_updated['Senha'] = e_pass
+
+            old_phone = row['Telefone']
+            if e_tel != old_phone:
+                rename_user_dir(old_phone, e_tel)
+                get_notifications().rename_user(old_phone, e_tel)
+                save_user(user_updated, old_phone_key=old_phone)
+            else:
+                save_user(user_updated, old_phone_key=old_phone)
+
+            st.session_state['prof_aberto'] = clean_phone_number(e_tel)
+            st.success("Atualizado!")
+            st.rerun()
+
+    # Botão Excluir
+    col_del_1, col_del_2 = st.columns([3,1])
+    with col_del_2:
+        if st.button("🗑️ Excluir Conta", key=f"del_{key}"):
+            start_job("exclusao", f"Excluir {row['Nome']}", delete_user, row['Telefone'],
+                      author=st.session_state['user']['Nome'], writes=True)
+            st.session_state.pop('prof_aberto', None)
+            st.rerun()
+
+    # WhatsApp Link
+    st.markdown("---")
+    if key:
+        link_wa = f"https://wa.me/55{key}"
+        st.markdown(f'<div style="text-align:right"><a href="{link_wa}" target="_blank" class="whatsapp-btn">💬 Conversar no WhatsApp</a></div>', unsafe_allow_html=True)
+
+JOB_STATUS_LABELS = {"pendente": "Na fila", "executando": "Em andamento", "concluida": "Concluída", "erro": "Falhou"}
+
+def render_job(job):
+    """Progresso ou desfecho de uma tarefa."""
+    status = JOB_STATUS_LABELS.get(job['status'], job['status'])
+    if job['status'] in ("pendente", "executando"):
+        st.progress(job['progresso'], text=f"{job['descricao']} — {job['mensagem'] or status}")
+        return
+    if job['status'] == "erro":
+        st.error(f"{job['descricao']}: {job['erro']}")
+        return
+    resultado = job['resultado']
+    if isinstance(resultado, dict) and 'importados' in resultado:
+        st.success(f"{job['descricao']}: {resultado['importados']} profissional(is) importado(s).")
+        if resultado['erros']:
+            st.warning(f"{len(resultado['erros'])} linha(s) com problema:")
+            st.dataframe(pd.DataFrame(resultado['erros'], columns=["Linha", "Problema"]), hide_index=True, use_container_width=True)
+    else:
+        st.success(f"{job['descricao']}: {status.lower()}.")
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def jobs_panel():
+    """Tarefas iniciadas nesta sessão; recarrega a página quando alguma termina."""
+    runner = get_jobs()
+    jobs = [job for job in map(runner.get, st.session_state.get("_jobs", [])) if job]
+    finished = st.session_state.setdefault("_jobs_finished", set())
+    newly_finished = False
+    for job in jobs:
+        render_job(job)
+        if job['status'] in ("concluida", "erro") and job['id'] not in finished:
+            finished.add(job['id'])
+            newly_finished = True
+    if jobs and all(job['id'] in finished for job in jobs):
+        if st.button("Dispensar", key="jobs_dismiss"):
+            st.session_state["_jobs"] = []
+            st.rerun()
+    if newly_finished:
+        st.rerun()  # os dados da página mudaram
+
+@instrumented
+def screen_admin_dashboard(user):
+    st.markdown(f"<h1 class='main-header'>Painel de Gestão</h1>", unsafe_allow_html=True)
+    st.write(f"Logado como: **{user['Nome']}** (Administrador)")
+    if st.session_state.get("_jobs"):
+        jobs_panel()
+    
+    tabs = st.tabs(["📊 Visão Geral", "📢 Comunicação", "📆 Calendário", "👥 Gestão de Profissionais", "📤 Arquivos", "🩺 Diagnóstico", "🗄️ Backups"])
+    
+    df = load_db(['Telefone', 'Nome', 'Role', 'Unidade', 'Data Cadastro'])
+    users_only = find_users(df.columns, exclude_role='admin')
+    
+    with tabs[0]: # Dashboard
+        stats = get_dashboard_stats()
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Total Profissionais", stats.professionals)
+        col2.metric("Unidades", len(stats.by_unit))
+        col3.metric("Cadastros Hoje", stats.signups_on(date.today()))
+        
+        st.markdown("---")
+        
+        # Aniversariantes
+        st.subheader("🎂 Aniversariantes")
+        birthday_index = get_birthday_index()
+        periodo = st.radio("Período", ["Este mês", "Esta semana", "Próximos dias"], horizontal=True, key="bday_period")
+        if periodo == "Este mês":
+            birthdays = birthday_index.this_month()
+        elif periodo == "Esta semana":
+            birthdays = birthday_index.this_week()
+        else:
+            dias = st.number_input("Quantidade de dias", min_value=1, max_value=366, value=30, key="bday_days")
+            birthdays = birthday_index.next_days(int(dias))
+        
+        if not birthdays.empty:
+            for nome, unidade, nascimento in birthdays.itertuples(index=False):
+                st.success(f"🎉 {nome} ({nascimento[:5]}) - {unidade}")
+        else:
+            st.info("Nenhum aniversariante encontrado para este período.")
+
+        if not birthday_index.invalid.empty:
+            with st.expander(f"⚠️ {len(birthday_index.invalid)} data(s) de nascimento inválida(s)"):
+                st.dataframe(birthday_index.invalid, use_container_width=True, hide_index=True)
+
+        st.markdown("---")
+        st.subheader("Profissionais por Unidade")
+        st.bar_chart(stats.units_chart())
+
+        st.subheader(f"Cadastros nos últimos {SIGNUP_CHART_DAYS} dias")
+        st.bar_chart(stats.signups_chart())
+
+    with tabs[1]: # Notificações
+        st.subheader("Enviar Notificação (Pop-up)")
+        
+        tipo_envio = st.radio("Destinatário", ["Todos os Usuários", "Unidade", "Individual"], horizontal=True)
+        with st.form("msg_form"):
+            texto_aviso = st.text_area("Mensagem do Aviso")
+            
+            phone_alvo = None
+            unidade_aviso = None
+            if tipo_envio == "Individual":
+                if not users_only.empty:
+                    escolha = st.selectbox("Selecione:", users_only['Nome'] + " - " + users_only['Telefone'])
+                    phone_alvo = escolha.split(" - ")[-1]
+            elif tipo_envio == "Unidade":
+                unidade_aviso = st.selectbox("Unidade:", UNIDADES_OPCOES)
+            
+            if st.form_submit_button("Enviar Aviso"):
+                if not texto_aviso:
+                    st.error("Escreva uma mensagem.")
+                else:
+                    if tipo_envio == "Todos os Usuários":
+                        qtd = send_notification_to_all(texto_aviso, author=user['Nome'])
+                        st.success(f"Mensagem enviada para {qtd} usuários!")
+                    elif tipo_envio == "Unidade":
+                        qtd = send_notification_to_unit(unidade_aviso, texto_aviso, author=user['Nome'])
+                        st.success(f"Mensagem enviada para {qtd} usuários da unidade!")
+                    else:
+                        if send_notification_individual(phone_alvo, texto_aviso, author=user['Nome']):
+                            st.success("Mensagem enviada para o usuário!")
+
+        st.markdown("#### 📜 Últimos avisos enviados")
+        historico = get_notifications().recent()
+        if historico:
+            alvo_label = {"todos": "Todos", "unidade": "Unidade", "usuario": "Individual"}
+            st.dataframe(
+                pd.DataFrame([
+                    {"Data": n['criado_em'], "Destino": f"{alvo_label.get(n['alvo'], n['alvo'])} {n['destino']}".strip(), "Mensagem": n['mensagem'], "Autor": n['autor']}
+                    for n in historico
+                ]),
+                use_container_width=True, hide_index=True,
+            )
+        else:
+            st.caption("Nenhum aviso enviado ainda.")
+
+    with tabs[2]: # Calendário (CRUD)
+        eventos = get_events()
+        c1, c2 = st.columns([1, 2])
+
+        with c2:
+            st.markdown("### 📋 Eventos")
+            encerrados = st.toggle("Mostrar eventos encerrados", key="eventos_encerrados")
+            lista = eventos.listing(None if encerrados else date.today())
+            opcoes = {e['id']: f"{date.fromisoformat(e['data']):%d/%m/%Y} — {e['titulo']}" for e in lista}
+            if st.session_state.get('evento_aberto') not in opcoes:
+                st.session_state['evento_aberto'] = None  # excluído ou fora do filtro
+            if lista:
+                st.dataframe(
+                    pd.DataFrame([
+                        {"Data": f"{date.fromisoformat(e['data']):%d/%m/%Y}", "Evento": e['titulo'], "Status": e['status'],
+                         "Unidade": e['unidade'] or "Todas", "Repetição": format_recurrence(e), "Destaque": "⚠️" if e['destaque'] else ""}
+                        for e in lista
+                    ]),
+                    use_container_width=True, hide_index=True,
+                )
+            else:
+                st.caption("Nenhum evento cadastrado.")
+            escolhido = st.selectbox("Editar evento", [None, *opcoes], key="evento_aberto",
+                                     format_func=lambda i: "➕ Novo evento" if i is None else opcoes[i])
+
+        with c1:
+            atual = eventos.get(escolhido) if escolhido else None
+            st.markdown("### ✏️ Editar Evento" if atual else "### ➕ Novo Evento")
+            with st.form(f"evento_{escolhido or 'novo'}"):
+                titulo = st.text_input("Título", value=atual['titulo'] if atual else "")
+                data_evento = st.date_input("Data", value=date.fromisoformat(atual['data']) if atual else date.today(), format="DD/MM/YYYY")
+                status = st.text_input("Status", value=atual['status'] if atual else "", placeholder="Ex.: Feriado, Confirmado, Fechado")
+                unidades = ["", *UNIDADES_OPCOES]
+                unidade = st.selectbox("Unidade", unidades, index=unidades.index(atual['unidade']) if atual and atual['unidade'] in unidades else 0,
+                                       format_func=lambda u: u or "Todas as unidades")
+                repeticoes = list(RECURRENCE_LABELS)
+                recorrencia = st.selectbox("Repetição", repeticoes, index=repeticoes.index(atual['recorrencia']) if atual else 0,
+                                           format_func=RECURRENCE_LABELS.get)
+                ate = st.date_input("Repetir até (opcional)", value=date.fromisoformat(atual['ate']) if atual and atual['ate'] else None, format="DD/MM/YYYY")
+                destaque = st.checkbox("Destacar no painel dos profissionais", value=bool(atual and atual['destaque']))
+
+                if st.form_submit_button("💾 Salvar Evento"):
+                    campos = {"data": data_evento.isoformat(), "titulo": titulo, "status": status, "unidade": unidade,
+                              "recorrencia": recorrencia, "ate": ate.isoformat() if ate else "", "destaque": destaque}
+                    try:
+                        if atual:
+                            eventos.update(atual['id'], campos)
+                        else:
+                            eventos.add(campos)
+                    except ValueError as e:
+                        st.error(str(e))
+                    else:
+                        st.success("Evento salvo!")
+                        st.rerun()
+
+            if atual and st.button("🗑️ Excluir Evento", key=f"del_evento_{atual['id']}"):
+                eventos.delete(atual['id'])
+                st.rerun()
+
+    with tabs[3]: # Gestão (CRUD)
+        c1, c2 = st.columns([1, 2])
+        
+        with c1:
+            st.markdown("### ➕ Cadastrar Novo")
+            with st.form("new_user"):
+                nome = st.text_input("Nome")
+                celular = st.text_input("Celular (Login)")
+                senha_temp = st.text_input("Senha Inicial")
+                unidade = st.selectbox("Unidade", UNIDADES_OPCOES)
+                
+                if st.form_submit_button("Criar Cadastro"):
+                    if not celular or not nome:
+                        st.error("Celular e Nome obrigatórios.")
+                    elif user_exists(celular):
+                        st.error("Celular já cadastrado.")
+                    else:
+                        new_data = {
+                            "Nome": nome, "Telefone": celular, "Senha": senha_temp,
+                            "Role": "user", "Unidade": unidade, "Data Cadastro": datetime.now().strftime("%Y-%m-%d"),
+                            "Email": "", "Notificacao": "", "Resumo": "", "Nascimento": "", "Pix": "", "Banco": ""
+                        }
+                        save_user(new_data)
+                        clear_notification(new_data)  # avisos antigos não contam como novos
+                        ensure_user_dirs(celular)
+                        st.success("Cadastrado com sucesso!")
+                        st.rerun()
+
+            with st.expander("📥 Importar planilha (XLSX/CSV)"):
+                st.caption("Colunas: Nome, Telefone, Unidade, Senha e, opcionalmente, Email, Pix, Banco, Nascimento, Resumo.")
+                planilha = st.file_uploader("Planilha", type=['xlsx', 'csv'], key="import_file")
+                tudo_ou_nada = st.checkbox("Cancelar tudo se alguma linha tiver erro")
+                if planilha and st.button("Importar"):
+                    copia = io.BytesIO(planilha.getvalue())  # o upload pertence à sessão
+                    copia.name = planilha.name
+                    start_job("importacao", f"Importar {planilha.name}", import_users, copia,
+                              all_or_nothing=tudo_ou_nada, author=user['Nome'], writes=True)
+                    st.rerun()
+
+            with st.expander("📤 Exportar profissionais"):
+                formato = st.radio("Formato", ["xlsx", "csv"], horizontal=True, key="export_fmt")
+                sensiveis = st.checkbox("Incluir dados sensíveis (e-mail, PIX, banco, nascimento, resumo)", key="export_sensitive")
+                st.download_button(
+                    "⬇️ Baixar planilha",
+                    lambda: export_users(formato, sensiveis),
+                    file_name=f"profissionais_{datetime.now().strftime('%Y%m%d')}.{formato}",
+                    mime=guess_mime(f"x.{formato}"),
+                    on_click="ignore",
+                )
+        
+        with c2:
+            st.markdown("### 📋 Lista de Profissionais")
+            
+            # Filtro de Busca
+            search_term = st.text_input("🔍 Buscar Profissional", placeholder="Nome, unidade ou especialidade (ex.: pilates gestante)")
+            
+            if users_only.empty:
+                st.info("Nenhum profissional cadastrado.")
+            else:
+                sc1, sc2, sc3 = st.columns([2, 1, 1])
+                order_col = sc1.selectbox("Ordenar por", LIST_SORT_COLUMNS, key="list_sort")
+                descending = sc2.toggle("Decrescente", key="list_desc")
+                page_size = sc3.selectbox("Por página", PAGE_SIZE_OPTIONS, key="list_page_size")
+
+                if search_term:
+                    filtered_users = search_users(search_term, ['Telefone', 'Nome', 'Role', 'Unidade', 'Data Cadastro'])
+                else:
+                    filtered_users = sorted_users(order_col, not descending, exclude_role='admin')
+
+                total_pages = max(1, -(-len(filtered_users) // page_size))
+                if st.session_state.get('list_page', 1) > total_pages:
+                    st.session_state['list_page'] = total_pages
+                page = st.number_input(f"Página (de {total_pages})", min_value=1, max_value=total_pages, value=1, key="list_page")
+                page_rows = filtered_users.iloc[(page - 1) * page_size: page * page_size]
+                st.caption(f"{len(filtered_users)} profissional(is) encontrado(s).")
+
+                opened = st.session_state.get('prof_aberto')
+                for phone, nome, unidade in page_rows[['Telefone', 'Nome', 'Unidade']].itertuples(index=False):
+                    key = clean_phone_number(phone)
+                    r1, r2 = st.columns([5, 1])
+                    r1.markdown(f"**{nome}** | {unidade}")
+                    is_open = opened == key
+                    if r2.button("Fechar" if is_open else "Abrir", key=f"open_{key}"):
+                        st.session_state['prof_aberto'] = None if is_open else key
+                        st.rerun()
+                    if is_open:
+                        record = get_user(phone)
+                        if record:
+                            with st.container(border=True):
+                                render_professional_detail(record)
+
+    with tabs[4]: # Arquivos (Gestão Completa)
+        st.subheader("📂 Central de Arquivos")
+        
+        if not users_only.empty:
+            # Seleção de usuário
+            destinatario = st.selectbox("Gerenciar arquivos de:", users_only['Nome'] + " - " + users_only['Telefone'])
+            phone_dest = destinatario.split(" - ")[-1]
+            
+            # Paths
+            inbox, outbox = ensure_user_dirs(phone_dest) # Inbox: Admin -> User | Outbox: User -> Admin
+            
+            # Upload Admin
+            st.markdown("#### 📤 Enviar novo arquivo")
+            file = st.file_uploader("Selecione o documento (PDF/Imagem)", type=['pdf', 'xlsx', 'jpg', 'png'])
+            alvo = st.radio("Enviar para", ["Profissional selecionado", "Todos os profissionais", "Uma unidade"], horizontal=True)
+            unidade_alvo = None
+            if alvo == "Uma unidade":
+                unidade_alvo = st.selectbox("Unidade de destino", UNIDADES_OPCOES)
+            if file and st.button("Enviar Arquivo"):
+                if alvo == "Profissional selecionado":
+                    phones = [phone_dest]
+                else:
+                    phones = find_users(['Telefone'], unit=unidade_alvo, exclude_role='admin')['Telefone'].tolist()
+                qtd = send_file_to_users(file, phones, uploader=user['Nome'])
+                if qtd:
+                    st.success(f"Arquivo enviado para {qtd} profissional(is)!")
+                    st.rerun()
+                elif qtd == 0:
+                    st.warning("Nenhum profissional encontrado para este destino.")
+            
+            st.divider()
+
+            # Gestão de Arquivos Existentes
+            used_in, used_out = user_storage(phone_dest)
+            m1, m2, m3 = st.columns(3)
+            m1.metric("Enviados pela gestão", format_size(used_in))
+            m2.metric("Enviados pelo profissional", format_size(used_out))
+            m3.metric("Cota utilizada", f"{(used_in + used_out) / USER_QUOTA_BYTES:.0%}")
+            st.download_button(
+                "📦 Baixar tudo (.zip)",
+                lambda: user_archive(phone_dest),
+                file_name=f"documentos_{clean_phone_number(phone_dest)}.zip",
+                mime="application/zip",
+                on_click="ignore",
+                disabled=not (used_in or used_out) or used_in + used_out > MAX_ZIP_BYTES,
+                help=f"Disponível para pacotes de até {format_size(MAX_ZIP_BYTES)}.",
+            )
+
+            f1, f2, f3 = st.columns([2, 1, 1])
+            file_filter = f1.text_input("🔍 Filtrar arquivos", placeholder="Parte do nome...")
+            sort_label = f2.selectbox("Ordenar por", list(FILE_SORT_OPTIONS))
+            file_desc = f3.toggle("Decrescente", value=True, key="files_desc")
+            sort_key = FILE_SORT_OPTIONS[sort_label]
+
+            col_in, col_out = st.columns(2)
+            
+            with col_in:
+                st.info(f"📂 Enviados pela GESTÃO (Visível para {phone_dest})")
+                files_in = list_files(inbox, sort_key, file_desc, file_filter)
+                if files_in:
+                    for meta in files_in:
+                        f = meta['name']
+                        c1, c2 = st.columns([4, 1])
+                        c1.text(f"📄 {f}")
+                        c1.caption(file_caption(meta))
+                        thumb = cached_preview(inbox, meta)
+                        if thumb:
+                            c1.image(thumb, width=160)
+                        if c2.button("🗑️", key=f"del_in_{f}"):
+                            if delete_file(inbox, f):
+                                st.rerun()
+                else:
+                    st.caption("Nenhum arquivo enviado.")
+            
+            with col_out:
+                st.warning(f"📂 Enviados pelo PROFISSIONAL (Recebidos)")
+                files_out = list_files(outbox, sort_key, file_desc, file_filter)
+                if files_out:
+                    for meta in files_out:
+                        f = meta['name']
+                        c1, c2, c3 = st.columns([3, 1, 1])
+                        c1.text(f"📎 {f}")
+                        c1.caption(file_caption(meta))
+                        thumb = cached_preview(outbox, meta)
+                        if thumb:
+                            c1.image(thumb, width=160)
+                        c2.download_button("⬇️", lazy_file(os.path.join(outbox, f)), file_name=f, mime=guess_mime(f), key=f"dl_out_{f}", on_click="ignore")
+                        if c3.button("🗑️", key=f"del_out_{f}"):
+                            if delete_file(outbox, f):
+                                st.rerun()
+                else:
+                    st.caption("O profissional ainda não enviou arquivos.")
+
+            with st.expander("📦 Baixar documentos de uma unidade"):
+                unidade_zip = st.selectbox("Unidade", UNIDADES_OPCOES, key="zip_unit")
+                # Soma os manifestos da unidade só sob demanda, antes de liberar o download.
+                if st.button("📏 Calcular tamanho", key="zip_size"):
+                    pessoas = find_users(['Telefone'], unit=unidade_zip, exclude_role='admin')['Telefone']
+                    st.session_state['zip_unidade'] = (unidade_zip, group_storage(pessoas))
+                calculado = st.session_state.get('zip_unidade')
+                if calculado and calculado[0] == unidade_zip:
+                    total = calculado[1]
+                    if total > MAX_ZIP_BYTES:
+                        st.warning(f"A unidade tem {format_size(total)} em documentos; o limite do pacote é {format_size(MAX_ZIP_BYTES)}.")
+                    st.download_button(
+                        f"📦 Baixar tudo da unidade (.zip, {format_size(total)})",
+                        lambda: group_archive(find_users(['Telefone', 'Nome'], unit=unidade_zip, exclude_role='admin').itertuples(index=False)),
+                        file_name=f"documentos_{archive_name(unidade_zip)}.zip",
+                        mime="application/zip",
+                        on_click="ignore",
+                        disabled=not total or total > MAX_ZIP_BYTES,
+                    )
+
+            with st.expander("💾 Armazenamento por profissional"):
+                # Lê o manifesto de cada profissional: só sob demanda, não a cada rerun.
+                calculado = st.session_state.get('armazenamento')
+                if st.button("🔄 Atualizar" if calculado else "📊 Calcular uso", key="calc_storage"):
+                    usage = []
+                    for nome, telefone in users_only[['Nome', 'Telefone']].itertuples(index=False):
+                        used_in, used_out = user_storage(telefone)
+                        usage.append({"Profissional": nome, "Recebidos (MB)": used_in / 1048576, "Enviados (MB)": used_out / 1048576, "Total (MB)": (used_in + used_out) / 1048576})
+                    calculado = (datetime.now(), pd.DataFrame(usage).sort_values("Total (MB)", ascending=False))
+                    st.session_state['armazenamento'] = calculado
+                if calculado:
+                    st.caption(f"Calculado em {calculado[0]:%d/%m/%Y %H:%M}.")
+                    st.dataframe(calculado[1], use_container_width=True, hide_index=True)
+
+        else:
+            st.warning("Cadastre profissionais primeiro para gerenciar arquivos.")
+
+    with tabs[5]: # Diagnóstico
+        metrics = get_metrics()
+        st.markdown("### 🩺 Tempos das operações")
+        st.caption(f"Últimas {METRICS_WINDOW} medições de cada operação neste servidor, desde {metrics.since:%d/%m/%Y %H:%M}.")
+        resumo = metrics.summary()
+        if resumo.empty:
+            st.info("Nenhuma medição ainda.")
+        else:
+            st.dataframe(resumo, use_container_width=True, hide_index=True)
+
+        contadores = metrics.counter_values()
+        if contadores:
+            st.markdown("#### Contadores de E/S")
+            st.dataframe(pd.DataFrame(sorted(contadores.items()), columns=["Contador", "Valor"]), use_container_width=True, hide_index=True)
+
+        d1, d2 = st.columns(2)
+        d1.button("🧹 Zerar medições", on_click=metrics.reset)
+        d2.button("⏱️ Perfilar a próxima execução", on_click=lambda: st.session_state.update(_profile_next=True),
+                  help="Roda a próxima atualização desta página sob o cProfile.")
+        perfil = st.session_state.get("_profile_data")
+        if perfil:
+            st.download_button("⬇️ Baixar perfil (.prof)", perfil["dados"], file_name=perfil["arquivo"],
+                               mime="application/octet-stream")
+            with st.expander(f"Funções mais custosas ({perfil['arquivo']})"):
+                st.code(perfil["resumo"])
+
+    with tabs[6]: # Backups
+        st.markdown("### 🗄️ Snapshots")
+        st.caption(f"Cadastro, avisos e documentos. Arquivos que não mudaram são compartilhados com o snapshot anterior; os {SNAPSHOT_KEEP} mais recentes são mantidos.")
+        if st.button("📸 Criar snapshot agora"):
+            start_job("snapshot", "Snapshot", create_snapshot, author=user['Nome'])
+            st.rerun()
+
+        snapshots = list_snapshots()
+        if not snapshots:
+            st.info("Nenhum snapshot ainda.")
+        else:
+            st.dataframe(pd.DataFrame([{
+                "Snapshot": meta["nome"], "Criado em": meta["criado_em"], "Motivo": meta["motivo"],
+                "Arquivos": meta.get("arquivos", 0), "Copiados": meta.get("copiados", 0),
+                "Reaproveitados": meta.get("reaproveitados", 0), "Novos dados": format_size(meta.get("bytes_copiados", 0)),
+            } for meta in snapshots]), use_container_width=True, hide_index=True)
+
+            with st.expander("♻️ Restaurar um snapshot"):
+                st.warning("O cadastro, os avisos e os documentos voltam ao estado do snapshot. O estado atual é salvo antes num novo snapshot.")
+                escolhido = st.selectbox("Snapshot", [meta["nome"] for meta in snapshots], key="restore_snapshot")
+                confirmacao = st.text_input("Digite 'RESTAURAR' para confirmar:", key="restore_confirm")
+                if st.button("Restaurar", disabled=confirmacao != "RESTAURAR"):
+                    start_job("restauracao", f"Restaurar {escolhido}", restore_snapshot, escolhido,
+                              author=user['Nome'], writes=True)
+                    st.rerun()
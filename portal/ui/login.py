@@ -0,0 +1,115 @@
+"""Telas de acesso: criação do primeiro administrador e login."""
+import os
+import shutil
+from datetime import datetime
+
+import streamlit as st
+
+from ..auth import check_login, get_auth_executor, get_login_throttle
+from ..config import BASE_FILES_DIR
+from ..diagnostics import instrumented
+from ..files import ensure_user_dirs
+from ..snapshots import create_snapshot
+from ..storage import get_state_db, get_storage
+from ..users import get_user, save_user, update_users
+from .user import set_session_user
+
+# --- INTERFACE: TELAS ---
+
+@instrumented
+def screen_setup_admin():
+    st.markdown("<h1 class='main-header'>🚀 Configuração Inicial</h1>", unsafe_allow_html=True)
+    st.info("Bem-vindo! Crie a conta do ADMINISTRADOR MASTER para iniciar.")
+    
+    with st.form("setup_form"):
+        col1, col2 = st.columns(2)
+        nome = col1.text_input("Nome do Gestor")
+        telefone = col1.text_input("Celular (Login)", placeholder="Ex: 11999998888")
+        senha = col2.text_input("Senha", type="password")
+        
+        if st.form_submit_button("Inicializar Sistema"):
+            if not telefone or not nome or not senha:
+                st.error("Preencha todos os campos.")
+            else:
+                admin_data = {
+                    "Nome": nome, "Senha": senha, 
+                    "Role": "admin", "Unidade": "Matriz",
+                    "Data Cadastro": datetime.now().strftime("%Y-%m-%d"),
+                    "Email": "", "Telefone": telefone, "Notificacao": "", "Resumo": "",
+                    "Nascimento": ""
+                }
+                save_user(admin_data)
+                ensure_user_dirs(telefone)
+                st.success("Administrador criado! Atualize a página.")
+                st.balloons()
+
+@instrumented
+def screen_login():
+    col1, col2, col3 = st.columns([1,2,1])
+    with col2:
+        st.markdown("<div style='text-align: center; margin-top: 50px;'>", unsafe_allow_html=True)
+        st.image("https://img.icons8.com/ios/100/228BE6/hospital-3.png", width=80)
+        st.markdown("<h2 style='color: #004E98;'>Portal Corpore</h2></div>", unsafe_allow_html=True)
+        
+        with st.form("login_form"):
+            st.markdown("##### Acesso Seguro")
+            telefone_login = st.text_input("Celular Cadastrado", placeholder="Digite apenas números")
+            senha = st.text_input("Senha", type="password")
+            submitted = st.form_submit_button("Entrar no Portal", use_container_width=True)
+            
+            if submitted:
+                st.session_state.pop("_login_error", None)
+                throttle = get_login_throttle()
+                wait = throttle.retry_after(telefone_login)
+                pending = "_login_pending" in st.session_state
+                user_data = get_user(telefone_login) if not (wait or pending) else None
+
+                if pending:
+                    st.warning("Aguarde a verificação da tentativa anterior.")
+                elif wait:
+                    st.error(f"Muitas tentativas. Tente novamente em {wait} s.")
+                elif user_data:
+                    # A tentativa conta já no envio: envios seguidos não escapam do
+                    # limite enquanto o KDF roda. Um acerto zera o contador.
+                    throttle.failed(user_data['Telefone'])
+                    future = get_auth_executor().submit(check_login, user_data['Senha'], senha)
+                    st.session_state["_login_pending"] = (user_data['Telefone'], future)
+                else:
+                    throttle.failed(telefone_login)
+                    st.error("Celular não encontrado.")
+
+        if "_login_pending" in st.session_state:
+            login_pending()
+        elif "_login_error" in st.session_state:
+            st.error(st.session_state["_login_error"])
+
+        st.markdown("<br>", unsafe_allow_html=True)
+        with st.expander("🆘 Resetar Sistema (Apenas Emergência)"):
+            confirm_code = st.text_input("Digite 'RESETAR' para confirmar:")
+            if st.button("🗑️ DELETAR TUDO", type="primary"):
+                if confirm_code == "RESETAR":
+                    create_snapshot("antes do reset")  # o reset pode ser desfeito pela aba Backups
+                    get_storage().destroy()
+                    get_state_db().destroy()
+                    if os.path.exists(BASE_FILES_DIR): shutil.rmtree(BASE_FILES_DIR)
+                    st.session_state.clear()
+                    st.rerun()
+
+@st.fragment(run_every=0.3)
+def login_pending():
+    """Aguarda a verificação da senha (feita fora do rerun) e conclui o login."""
+    phone, future = st.session_state["_login_pending"]
+    if not future.done():
+        st.caption("⏳ Verificando credenciais...")
+        return
+    del st.session_state["_login_pending"]
+    ok, new_hash = future.result()
+    throttle = get_login_throttle()
+    if not ok:  # a falha já foi contada no envio
+        st.session_state["_login_error"] = "Senha incorreta."
+        st.rerun()
+    throttle.succeeded(phone)
+    if new_hash:
+        update_users([phone], {"Senha": new_hash})
+    set_session_user(get_user(phone))
+    st.rerun()
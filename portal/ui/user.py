@@ -0,0 +1,198 @@
+"""Painel do profissional e estado de sessão do usuário logado."""
+import os
+import html
+from datetime import date
+
+import streamlit as st
+
+from ..config import CHANGE_POLL_SECONDS
+from ..diagnostics import instrumented
+from ..events import MONTH_NAMES, month_view
+from ..files import (
+    ensure_user_dirs, file_caption, get_files, guess_mime, lazy_file, list_files,
+    save_uploaded_file
+)
+from ..notifications import clear_notification, get_notifications
+from ..users import find_users, get_repository, save_user
+from ..util import clean_phone_number
+
+_FEED_STATE_KEYS = ('user_version', 'avisos_pendentes', 'aviso_visto', 'avisos_unidade')
+
+def set_session_user(user_data):
+    """Troca o usuário da sessão e zera o estado do acompanhamento de mudanças."""
+    for key in _FEED_STATE_KEYS:
+        st.session_state.pop(key, None)
+    st.session_state['user'] = user_data
+
+def _shift_month(delta):
+    """Navegação do calendário: `delta` meses a partir do mês visível (0 volta ao atual)."""
+    if not delta:
+        st.session_state['cal_mes'] = date.today().replace(day=1)
+        return
+    mes = st.session_state.get('cal_mes', date.today().replace(day=1))
+    index = mes.year * 12 + mes.month - 1 + delta
+    st.session_state['cal_mes'] = date(index // 12, index % 12 + 1, 1)
+
+def _dismiss_notifications(user, up_to_id):
+    clear_notification(user, up_to_id)
+    st.session_state['avisos_pendentes'] = []
+
+@st.fragment(run_every=CHANGE_POLL_SECONDS)
+def user_change_feed():
+    """Acompanha, por polling barato, o registro do usuário logado e seus avisos.
+
+    A cada ciclo compara só números de versão; o registro é relido (uma
+    busca no índice) apenas se a versão dele mudou, e os avisos só são
+    consultados se surgiu algum id novo no log.
+    """
+    user = st.session_state.get('user')
+    if not user:
+        return
+    repo, store = get_repository(), get_notifications()
+    state = st.session_state
+
+    # Registro do usuário
+    version = repo.user_version(user['Telefone'])
+    if state.get('user_version') is None:
+        state['user_version'] = version
+    elif version != state['user_version']:
+        state['user_version'] = version
+        fresh = repo.get(user['Telefone'])
+        if fresh is None:
+            set_session_user(None)
+            st.rerun()
+        if fresh != user:
+            state['user'] = fresh
+            if any(fresh.get(col) != user.get(col) for col in ('Nome', 'Unidade', 'Role')):
+                st.rerun()
+            user = fresh
+
+    # Avisos: só o que chegou depois do último id visto
+    latest = store.latest_id()
+    if 'avisos_pendentes' not in state or state.get('avisos_unidade') != user.get('Unidade'):
+        state['avisos_pendentes'] = store.unread(user['Telefone'], user.get('Unidade'))
+        state['avisos_unidade'] = user.get('Unidade')
+        state['aviso_visto'] = latest
+    elif latest > state['aviso_visto']:
+        novos = store.for_user(user['Telefone'], user.get('Unidade'), after_id=state['aviso_visto'])
+        state['avisos_pendentes'] = novos + state['avisos_pendentes']
+        state['aviso_visto'] = latest
+
+    avisos = state['avisos_pendentes']
+    if avisos:
+        itens = "".join(f"<p><small>{html.escape(a['criado_em'])}</small><br>{html.escape(a['mensagem'])}</p>" for a in avisos)
+        st.markdown(f"""
+        <div style="background-color: #fff3cd; color: #856404; padding: 15px; border-radius: 5px; border: 1px solid #ffeeba; margin-bottom: 20px;">
+            <h4>🔔 Novo Aviso da Gestão</h4>
+            {itens}
+        </div>
+        """, unsafe_allow_html=True)
+        st.button("✅ Marcar como lida e fechar", on_click=_dismiss_notifications, args=(user, avisos[0]['id']))
+
+@instrumented
+def screen_user_dashboard(user):
+    # Notificações e alterações feitas pela gestão (atualizado sozinho)
+    user_change_feed()
+
+    st.markdown(f"<h1 class='main-header'>Portal do Colaborador</h1>", unsafe_allow_html=True)
+    
+    # Sidebar
+    st.sidebar.markdown(f"### 👤 {user['Nome']}")
+    st.sidebar.text(f"Unidade: {user.get('Unidade', '-')}")
+    
+    admin = find_users(['Telefone'], role='admin').head(1)
+    if not admin.empty:
+        admin_phone = clean_phone_number(admin.iloc[0]['Telefone'])
+        if admin_phone:
+            link_admin = f"https://wa.me/55{admin_phone}"
+            st.sidebar.markdown(f"""
+                <br><a href="{link_admin}" target="_blank" class="whatsapp-btn" style="display:block; text-align:center;">
+                📞 Falar com Gestão
+                </a><br>
+            """, unsafe_allow_html=True)
+    
+    if st.sidebar.button("Sair"):
+        set_session_user(None)
+        st.rerun()
+
+    tabs = st.tabs(["📌 Mural & Calendário", "📂 Documentos", "📝 Perfil Profissional"])
+
+    with tabs[0]:
+        mes = st.session_state.setdefault('cal_mes', date.today().replace(day=1))
+        n1, n2, n3 = st.columns([1, 6, 1])
+        n1.button("◀", key="cal_prev", on_click=_shift_month, args=(-1,), help="Mês anterior")
+        n2.subheader(f"📆 Calendário — {MONTH_NAMES[mes.month - 1]} de {mes.year}")
+        n3.button("▶", key="cal_next", on_click=_shift_month, args=(1,), help="Próximo mês")
+        grade, eventos_mes, destaques = month_view(mes, user.get('Unidade') or "")
+        col1, col2 = st.columns([2, 1])
+        
+        with col1:
+            st.markdown(grade, unsafe_allow_html=True)
+            if eventos_mes.empty:
+                st.caption("Nenhum evento neste mês.")
+            else:
+                st.dataframe(eventos_mes, use_container_width=True, hide_index=True)
+        
+        with col2:
+            for dia, titulo, status in destaques:
+                st.warning(f"⚠️ **{titulo}** — {dia}" + (f" ({status})" if status else ""))
+            if mes != date.today().replace(day=1):
+                st.button("Voltar para o mês atual", key="cal_today", on_click=_shift_month, args=(0,))
+
+        with st.expander("📜 Histórico de avisos"):
+            historico = get_notifications().for_user(user['Telefone'], user.get('Unidade'), limit=50)
+            if historico:
+                for aviso in historico:
+                    st.caption(aviso['criado_em'])
+                    st.write(aviso['mensagem'])
+            else:
+                st.caption("Nenhum aviso recebido.")
+
+    with tabs[1]:
+        inbox, outbox = ensure_user_dirs(user['Telefone'])
+        c1, c2 = st.columns(2)
+        with c1:
+            st.markdown("### 📥 Recebidos")
+            st.caption("Arquivos enviados pela Gestão para você.")
+            files = get_files(inbox)
+            if files:
+                for f in files:
+                    st.download_button(f"📄 {f}", lazy_file(os.path.join(inbox, f)), file_name=f, mime=guess_mime(f), key=f"dl_in_{f}", on_click="ignore")
+            else:
+                st.caption("Nenhum arquivo recebido.")
+        with c2:
+            st.markdown("### 📤 Enviar")
+            st.caption("Envie certificados, comprovantes ou fotos para a Gestão.")
+            up = st.file_uploader("Upload", key="up_u")
+            if up and st.button("Enviar"):
+                if save_uploaded_file(up, outbox, uploader=user['Nome']):
+                    st.success("Enviado!")
+            
+            st.markdown("#### Histórico de Envios")
+            for meta in list_files(outbox):
+                st.text(f"✅ {meta['name']}")
+                st.caption(file_caption(meta))
+
+    with tabs[2]:
+        st.subheader("Meu Resumo Profissional")
+        st.write("Mantenha seus dados atualizados para que a administração possa gerenciar repasses e direcionamentos.")
+        
+        with st.form("resumo_form"):
+            novo_resumo = st.text_area("Descrição Técnica / Público Alvo", value=user.get('Resumo', ''), height=200, help="Descreva suas especialidades.")
+            
+            c1, c2 = st.columns(2)
+            c_email = c1.text_input("E-mail", value=user.get('Email', ''))
+            c_nasc = c2.text_input("Data Nascimento (DD/MM/AAAA)", value=user.get('Nascimento', ''))
+            
+            c3, c4 = st.columns(2)
+            c_pix = c3.text_input("Chave PIX", value=user.get('Pix', ''))
+            c_banco = c4.text_input("Banco", value=user.get('Banco', ''))
+            
+            if st.form_submit_button("Salvar Perfil"):
+                user_updated = user.copy()
+                user_updated.update({
+                    "Resumo": novo_resumo, "Email": c_email, "Pix": c_pix, "Banco": c_banco, "Nascimento": c_nasc
+                })
+                save_user(user_updated, old_phone_key=user['Telefone'])
+                st.session_state['user'] = user_updated
+                st.success("Perfil atualizado com sucesso!")
@@ -0,0 +1,431 @@
+"""Tabela de usuários em memória (UserRepository) e a API de leitura/escrita usada pelas telas."""
+import threading
+
+import pandas as pd
+import streamlit as st
+
+from .auth import decrypt, encrypt, hash_pass, is_password_hash
+from .config import ALL_COLUMNS, SENSITIVE_COLUMNS
+from .diagnostics import instrumented
+from .files import delete_user_dir
+from .storage import get_storage
+from .util import clean_phone_number
+
+# --- BANCO DE DADOS ---
+# Em memória a tabela fica na forma gravada (campos sensíveis criptografados).
+# As colunas sensíveis só são decodificadas quando alguma tela as pede, uma
+# vez por versão dos dados, e as escritas atualizam o cache linha a linha.
+
+def map_unique(series, func):
+    """Aplica `func` uma única vez por valor distinto da coluna."""
+    if series.empty:
+        return series.copy()
+    uniques = pd.unique(series)
+    return series.map(dict(zip(uniques, map(func, uniques))))
+
+def encode_column(series):
+    return map_unique(series, encrypt)
+
+def decode_column(series):
+    return map_unique(series, decrypt)
+
+def decode_record(record):
+    """Converte um registro na forma gravada em dicionário legível."""
+    return {col: decrypt(record[col]) if col in SENSITIVE_COLUMNS else record[col] for col in ALL_COLUMNS}
+
+class UserRepository:
+    """Tabela de usuários compartilhada pelo processo, com índices de hash.
+
+    Índices por telefone normalizado (`clean_phone_number`), `Role` e
+    `Unidade` apontam para os rótulos das linhas e são mantidos a cada
+    escrita, sem varrer a tabela. O DataFrame só é relido quando a versão
+    do backend muda por fora deste processo.
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.lock = threading.RLock()
+        self.key = None
+        self.raw = None
+        self._decoded = {}
+        self._views = {}
+        self._derived = {}
+        self._maintained = {}
+        self._loaded_key = None
+        self._row_versions = {}
+        self._by_phone = {}
+        self._by_role = {}
+        self._by_unit = {}
+
+    # --- Sincronização e índices ---
+    def sync(self):
+        """Tabela na forma gravada, relida do backend apenas quando a versão muda."""
+        with self.lock:
+            key = self.storage.version()
+            if self.raw is None or self.key != key:
+                self.raw = self.storage.read()
+                self.key = key
+                self._decoded = {}
+                self._views = {}
+                self._derived = {}
+                self._maintained = {}
+                self._loaded_key = key
+                self._row_versions = {}
+                self._rebuild_indexes()
+            return self.raw
+
+    def _rebuild_indexes(self):
+        self._by_phone, self._by_role, self._by_unit = {}, {}, {}
+        raw = self.raw
+        for label, phone, role, unit in zip(raw.index, raw['Telefone'], raw['Role'], raw['Unidade']):
+            self._index(label, phone, role, unit)
+
+    def _index(self, label, phone, role, unit):
+        self._by_phone.setdefault(clean_phone_number(phone), []).append(label)
+        self._by_role.setdefault(role, set()).add(label)
+        self._by_unit.setdefault(unit, set()).add(label)
+
+    def _unindex(self, label):
+        row = self.raw.loc[label]
+        key = clean_phone_number(row['Telefone'])
+        labels = self._by_phone.get(key, [])
+        if label in labels:
+            labels.remove(label)
+        if not labels:
+            self._by_phone.pop(key, None)
+        self._by_role.get(row['Role'], set()).discard(label)
+        self._by_unit.get(row['Unidade'], set()).discard(label)
+
+    def _labels_for_phone(self, phone, exact=False):
+        """Rótulos do telefone (normalizado); `exact` exige o mesmo texto gravado."""
+        labels = self._by_phone.get(clean_phone_number(phone), [])
+        if exact:
+            return [label for label in labels if self.raw.at[label, 'Telefone'] == phone]
+        return list(labels)
+
+    # --- Leitura ---
+    def _decoded_column(self, col):
+        if col not in self._decoded:
+            self._decoded[col] = decode_column(self.raw[col])
+        return self._decoded[col]
+
+    def frame(self, columns=None):
+        """Visão com as colunas pedidas; só as sensíveis pedidas são decodificadas."""
+        columns = tuple(ALL_COLUMNS if columns is None else columns)
+        with self.lock:
+            raw = self.sync()
+            if columns not in self._views:
+                data = {col: self._decoded_column(col) if col in SENSITIVE_COLUMNS else raw[col] for col in columns}
+                self._views[columns] = pd.DataFrame(data, index=raw.index, columns=list(columns))
+            return self._views[columns]
+
+    def derived(self, name, build):
+        """Estrutura derivada da tabela (`build(repo)`), refeita só quando os dados mudam."""
+        with self.lock:
+            self.sync()
+            if name not in self._derived:
+                self._derived[name] = build(self)
+            return self._derived[name]
+
+    def maintained(self, name, build):
+        """Estrutura atualizada a cada escrita (via `add`/`discard` de linhas na
+        forma gravada); `build(repo)` só roda de novo após uma releitura completa."""
+        with self.lock:
+            self.sync()
+            if name not in self._maintained:
+                self._maintained[name] = build(self)
+            return self._maintained[name]
+
+    def _notify(self, old_rows, new_rows, columns=None):
+        """Repassa linhas removidas/incluídas às estruturas mantidas interessadas."""
+        for structure in self._maintained.values():
+            if columns is not None and not structure.COLUMNS & set(columns):
+                continue
+            for row in old_rows:
+                structure.discard(row)
+            for row in new_rows:
+                structure.add(row)
+
+    def get(self, phone):
+        """Registro decodificado pelo telefone, como quer que tenha sido digitado."""
+        with self.lock:
+            self.sync()
+            labels = self._by_phone.get(clean_phone_number(phone))
+            if not labels:
+                return None
+            return decode_record(self.raw.loc[labels[0]])
+
+    def stored_phone(self, phone):
+        """Telefone exatamente como está gravado (chave do backend), ou None."""
+        with self.lock:
+            self.sync()
+            labels = self._by_phone.get(clean_phone_number(phone))
+            return self.raw.at[labels[0], 'Telefone'] if labels else None
+
+    def exists(self, phone):
+        with self.lock:
+            self.sync()
+            return clean_phone_number(phone) in self._by_phone
+
+    def label_of(self, phone):
+        """Rótulo da linha do telefone na tabela em memória, ou None."""
+        with self.lock:
+            self.sync()
+            labels = self._by_phone.get(clean_phone_number(phone))
+            return labels[0] if labels else None
+
+    def labels(self, role=None, unit=None, exclude_role=None):
+        """Rótulos das linhas filtrados pelos índices secundários, na ordem da tabela."""
+        with self.lock:
+            raw = self.sync()
+            selected = None
+            if role is not None:
+                selected = set(self._by_role.get(role, ()))
+            if unit is not None:
+                by_unit = self._by_unit.get(unit, set())
+                selected = set(by_unit) if selected is None else selected & by_unit
+            if exclude_role is not None:
+                excluded = self._by_role.get(exclude_role, set())
+                selected = set(raw.index) - excluded if selected is None else selected - excluded
+            if selected is None:
+                return list(raw.index)
+            return sorted(selected)
+
+    def version(self):
+        """Versão global dos dados (barata: uma consulta ao backend)."""
+        with self.lock:
+            self.sync()
+            return self.key
+
+    def user_version(self, phone):
+        """Versão em que o registro do usuário mudou pela última vez.
+
+        Depois de uma releitura completa todos partem da versão carregada.
+        """
+        with self.lock:
+            self.sync()
+            return self._row_versions.get(clean_phone_number(phone), self._loaded_key)
+
+    def units(self):
+        with self.lock:
+            self.sync()
+            return [unit for unit, labels in self._by_unit.items() if labels]
+
+    # --- Escrita ---
+    def _apply_write(self, versions, mutate, phones=()):
+        """Reflete uma escrita no cache sem reler o backend.
+
+        Só é seguro se o cache estava na versão anterior à escrita; caso
+        contrário (outro processo gravou no meio) o cache é descartado.
+        `phones` são os usuários tocados, cuja versão individual avança.
+        """
+        before, after = versions
+        if self.raw is not None and self.key == before:
+            mutate()
+            self.key = after
+            for phone in phones:
+                self._row_versions[clean_phone_number(phone)] = after
+        else:
+            self.raw = None
+        self._views = {}
+        self._derived = {}
+
+    def upsert(self, record, old_key=None):
+        """Grava um registro (forma gravada); `old_key` é o telefone anterior."""
+        with self.lock:
+            self.sync()
+            versions = self.storage.upsert(record, old_key=old_key)
+
+            def mutate():
+                target = old_key if old_key else record['Telefone']
+                labels = self._labels_for_phone(target, exact=True)
+                labels += [l for l in self._labels_for_phone(record['Telefone'], exact=True) if l not in labels]
+                raw = self.raw
+                label = labels[0] if labels else (int(raw.index.max()) + 1 if len(raw) else 0)
+                old_rows = [raw.loc[l].to_dict() for l in labels]
+                for l in labels:
+                    self._unindex(l)
+                raw = raw.drop(index=labels[1:])
+                raw.loc[label] = [record[col] for col in ALL_COLUMNS]
+                self.raw = raw
+                self._index(label, record['Telefone'], record['Role'], record['Unidade'])
+                for col, series in self._decoded.items():
+                    series = series.drop(index=labels[1:])
+                    series.loc[label] = decrypt(record[col])
+                    self._decoded[col] = series
+                self._notify(old_rows, [record])
+
+            self._apply_write(versions, mutate, [record['Telefone'], old_key or record['Telefone']])
+
+    def delete(self, phone):
+        with self.lock:
+            self.sync()
+            versions = self.storage.delete(phone)
+
+            def mutate():
+                labels = self._labels_for_phone(phone, exact=True)
+                old_rows = [self.raw.loc[l].to_dict() for l in labels]
+                for l in labels:
+                    self._unindex(l)
+                self.raw = self.raw.drop(index=labels)
+                for col, series in self._decoded.items():
+                    self._decoded[col] = series.drop(index=labels)
+                self._notify(old_rows, [])
+
+            self._apply_write(versions, mutate, [phone])
+
+    def insert_many(self, records, atomic=False):
+        """Inclui vários registros novos (forma gravada) numa única escrita.
+
+        A existência de cada telefone é conferida de novo sob o lock: os que
+        foram cadastrados nesse meio-tempo ficam de fora (com `atomic`, nada
+        é gravado). Retorna (quantidade incluída, telefones ignorados).
+        """
+        with self.lock:
+            self.sync()
+            if records.empty:
+                return 0, []
+            taken = records['Telefone'].map(clean_phone_number).isin(self._by_phone.keys())
+            skipped = records.loc[taken, 'Telefone'].tolist()
+            if skipped and atomic:
+                return 0, skipped
+            records = records.loc[~taken]
+            if records.empty:
+                return 0, skipped
+            records = records.reindex(columns=ALL_COLUMNS).fillna("")
+            versions = self.storage.import_frame(records)
+
+            def mutate():
+                start = int(self.raw.index.max()) + 1 if len(self.raw) else 0
+                new = records.set_axis(range(start, start + len(records)))
+                self.raw = pd.concat([self.raw, new])
+                for label, phone, role, unit in zip(new.index, new['Telefone'], new['Role'], new['Unidade']):
+                    self._index(label, phone, role, unit)
+                for col, series in self._decoded.items():
+                    self._decoded[col] = pd.concat([series, decode_column(new[col])])
+                self._notify([], new.to_dict('records'))
+
+            self._apply_write(versions, mutate, records['Telefone'].tolist())
+            return len(records), skipped
+
+    def update_many(self, labels, changes):
+        """Aplica `changes` (coluna -> valor legível) às linhas com uma única gravação."""
+        with self.lock:
+            self.sync()
+            phones = self.raw.loc[labels, 'Telefone'].tolist()
+            if not phones:
+                return 0
+            encoded = _encode_changes(changes)
+            versions = self.storage.update_many(phones, encoded)
+
+            def mutate():
+                reindex = 'Role' in changes or 'Unidade' in changes
+                old_rows = self.raw.loc[labels].to_dict('records') if self._maintained else []
+                if reindex:
+                    for l in labels:
+                        self._unindex(l)
+                raw = self.raw.copy()
+                for col, value in encoded.items():
+                    raw.loc[labels, col] = value
+                self.raw = raw
+                if reindex:
+                    for l in labels:
+                        self._index(l, raw.at[l, 'Telefone'], raw.at[l, 'Role'], raw.at[l, 'Unidade'])
+                for col in changes:
+                    if col in self._decoded:
+                        series = self._decoded[col].copy()
+                        series.loc[labels] = changes[col]
+                        self._decoded[col] = series
+                if old_rows:
+                    self._notify(old_rows, raw.loc[labels].to_dict('records'), columns=changes)
+
+            self._apply_write(versions, mutate, phones)
+            return len(phones)
+
+@st.cache_resource
+def get_repository():
+    """Repositório de usuários compartilhado por todas as sessões do processo."""
+    return UserRepository(get_storage())
+
+@instrumented
+def load_db(columns=None):
+    """Retorna a tabela de usuários com as colunas pedidas (todas por padrão).
+
+    O DataFrame é compartilhado entre sessões: não altere in-place.
+    """
+    return get_repository().frame(columns)
+
+def find_users(columns=None, role=None, unit=None, exclude_role=None):
+    """Subconjunto da tabela selecionado pelos índices de `Role`/`Unidade`."""
+    repo = get_repository()
+    with repo.lock:
+        df = repo.frame(columns)
+        return df.loc[repo.labels(role=role, unit=unit, exclude_role=exclude_role)]
+
+def sorted_users(column, ascending=True, exclude_role=None):
+    """Profissionais ordenados por uma coluna não sensível (ordem memorizada por versão)."""
+    columns = ['Telefone', 'Nome', 'Role', 'Unidade', 'Data Cadastro']
+    return get_repository().derived(
+        ("ordem", column, ascending, exclude_role),
+        lambda repo: find_users(columns, exclude_role=exclude_role).sort_values(
+            column, ascending=ascending, kind='stable', key=lambda col: col.str.lower()
+        ),
+    )
+
+def get_user(phone):
+    """Registro decodificado de um único usuário, ou None."""
+    return get_repository().get(phone)
+
+def user_exists(phone):
+    return get_repository().exists(phone)
+
+def prepare_password(password):
+    """Senhas ainda em texto puro são convertidas em hash; hashes passam direto."""
+    if is_password_hash(password):
+        return password
+    return hash_pass(password)
+
+def _encode_changes(changes):
+    """Converte valores de colunas para a forma gravada (criptografia/hash)."""
+    encoded = {}
+    for col, value in changes.items():
+        if col in SENSITIVE_COLUMNS:
+            value = encrypt(value)
+        elif col == 'Senha':
+            value = prepare_password(value)
+        encoded[col] = value
+    return encoded
+
+@instrumented
+def save_user(user_data, old_phone_key=None):
+    data_to_save = _encode_changes({col: user_data.get(col, "") for col in ALL_COLUMNS})
+    get_repository().upsert(data_to_save, old_key=old_phone_key)
+
+@instrumented
+def delete_user(phone, progress=None):
+    repo = get_repository()
+    stored = repo.stored_phone(phone)
+    if stored is not None:
+        repo.delete(stored)
+    delete_user_dir(phone, progress)
+
+def update_users(mask_or_phones, changes):
+    """Aplica as mesmas alterações a vários usuários com uma única gravação.
+
+    `mask_or_phones` pode ser uma lista de telefones (em qualquer formato),
+    uma máscara booleana sobre a tabela ou uma função que recebe a tabela na
+    forma gravada (avaliada já com o lock de escrita) e devolve a máscara.
+    Retorna quantos usuários mudaram.
+    """
+    repo = get_repository()
+    with repo.lock:
+        raw = repo.sync()
+        if callable(mask_or_phones):
+            labels = raw.index[mask_or_phones(raw).astype(bool)].tolist()
+        elif isinstance(mask_or_phones, pd.Series):
+            labels = raw.index[mask_or_phones.reindex(raw.index, fill_value=False).astype(bool)].tolist()
+        else:
+            labels = []
+            for phone in mask_or_phones:
+                labels.extend(l for l in repo._labels_for_phone(phone) if l not in labels)
+        return repo.update_many(labels, changes)
@@ -0,0 +1,13 @@
+"""Normalização de telefones e textos, usada por todo o pacote."""
+import re
+import unicodedata
+
+def clean_phone_number(phone):
+    """Remove caracteres não numéricos."""
+    if not phone: return ""
+    return re.sub(r'\D', '', str(phone))
+
+def fold_text(text):
+    """Minúsculas sem acentos, para comparar cabeçalhos e buscas."""
+    normalized = unicodedata.normalize("NFKD", str(text))
+    return "".join(c for c in normalized if not unicodedata.combining(c)).strip().lower()